@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Benchmark - latency, throughput and memory of search and design-system generation
+
+Usage: python benchmark.py [--rows 5000] [--queries 200] [--output results.json]
+       python benchmark.py --rows 5000 --save-baseline baseline.json
+       python benchmark.py --rows 5000 --baseline baseline.json [--threshold 0.10]
+
+Corpora:
+  --rows 0     Benchmark the shipped data/ CSVs (default)
+  --rows N     Generate a synthetic corpus with N rows per domain and stack CSV,
+               in the same schemas: the real rows first, then rows whose cells
+               mix words drawn from the same column
+
+Workloads (each runs in its own process, so peak RSS is per workload):
+  search_cold    search() with in-process caches cleared and no persisted index
+  search_disk    search() with in-process caches cleared, persisted index on disk
+  search_warm    search() with warm in-process caches
+  stack_warm     search_stack() with warm in-process caches
+  search_all     search_all() over the global index, warm
+  design_system         generate_design_system() with the result cache off, warm
+  design_system_cached  generate_design_system() served from the result cache (hits only)
+
+Results are JSON: p50/p95/p99/mean latency in ms, throughput in ops/s and peak
+RSS in KiB per workload. With --baseline, each workload is compared against the
+saved run and the exit status is 1 if any latency or throughput regressed by
+more than --threshold.
+"""
+
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from core import CSV_CONFIG, STACK_CONFIG, DATA_DIR
+
+# ============ CONFIGURATION ============
+WORKLOADS = ["search_cold", "search_disk", "search_warm", "stack_warm", "search_all", "design_system",
+             "design_system_cached"]
+DS_WORKLOADS = {"design_system", "design_system_cached"}
+COLD_WORKLOADS = {"search_cold", "search_disk"}  # Rebuild or reload an index per query, so fewer queries
+DEFAULT_QUERIES = 200
+DEFAULT_COLD_QUERIES = 20
+DEFAULT_DS_QUERIES = 20
+DEFAULT_THRESHOLD = 0.10  # Relative change that counts as a regression
+MUTATE_RATE = 0.5  # Share of words replaced in each synthetic cell
+
+
+# ============ SYNTHETIC CORPUS ============
+def _read_csv(filepath):
+    with open(filepath, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        return header, [row for row in reader]
+
+
+def generate_corpus(target_dir, rows, seed=0):
+    """Write every data CSV to target_dir; domain and stack CSVs are scaled to `rows` rows"""
+    rng = random.Random(seed)
+    scaled = {config["file"] for config in CSV_CONFIG.values()} | {config["file"] for config in STACK_CONFIG.values()}
+    for source in sorted(DATA_DIR.rglob("*.csv")):
+        rel = source.relative_to(DATA_DIR).as_posix()
+        header, real_rows = _read_csv(source)
+        out_rows = real_rows
+        if rel in scaled and real_rows:
+            width = max(len(row) for row in real_rows)
+            vocab = [sorted({w for row in real_rows if i < len(row) for w in row[i].split()}) for i in range(width)]
+            out_rows = real_rows[:rows]
+            while len(out_rows) < rows:
+                base = real_rows[rng.randrange(len(real_rows))]
+                out_rows.append([
+                    " ".join(rng.choice(vocab[i]) if vocab[i] and rng.random() < MUTATE_RATE else w for w in cell.split())
+                    for i, cell in enumerate(base)
+                ])
+        target = Path(target_dir) / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(target, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(out_rows)
+
+
+# ============ QUERIES ============
+def _sample_words(rng, data_dir, file, cols, count):
+    """`count` queries of 1-3 words taken from random rows of one CSV"""
+    with open(Path(data_dir) / file, 'r', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    queries = []
+    for _ in range(count):
+        row = rows[rng.randrange(len(rows))]
+        words = " ".join(str(row.get(col, "")) for col in cols).split()
+        queries.append(" ".join(rng.sample(words, min(len(words), rng.randint(1, 3)))) if words else "")
+    return queries
+
+
+def make_queries(data_dir, count, seed=0):
+    """Deterministic workload inputs: (query, domain), (query, stack) and design-system queries"""
+    rng = random.Random(seed)
+    domains = sorted(CSV_CONFIG)
+    stacks = sorted(name for name, config in STACK_CONFIG.items() if (Path(data_dir) / config["file"]).exists())
+    search = []
+    for domain in (domains[i % len(domains)] for i in range(count)):
+        query = _sample_words(rng, data_dir, CSV_CONFIG[domain]["file"], CSV_CONFIG[domain]["search_cols"], 1)[0]
+        search.append([query, domain])
+    stack = []
+    for name in (stacks[i % len(stacks)] for i in range(count)):
+        query = _sample_words(rng, data_dir, STACK_CONFIG[name]["file"], ["Category", "Guideline"], 1)[0]
+        stack.append([query, name])
+    design = _sample_words(rng, data_dir, CSV_CONFIG["product"]["file"], ["Product Type", "Keywords"], count)
+    return {"search": search, "stack": stack, "design": design}
+
+
+# ============ MEASUREMENT ============
+def _peak_rss_kb():
+    """Peak resident set size of this process in KiB, or None where unavailable"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(timings_s, peak_rss_kb):
+    """Latency percentiles (ms), throughput (ops/s) and memory for one workload"""
+    ms = sorted(t * 1000 for t in timings_s)
+    total = sum(timings_s)
+    return {
+        "n": len(ms),
+        "p50_ms": round(_percentile(ms, 50), 4),
+        "p95_ms": round(_percentile(ms, 95), 4),
+        "p99_ms": round(_percentile(ms, 99), 4),
+        "mean_ms": round(total * 1000 / len(ms), 4),
+        "throughput_ops": round(len(ms) / total, 2) if total else None,
+        "peak_rss_kb": peak_rss_kb
+    }
+
+
+def run_workload(name, inputs):
+    """Run one workload in this process and return its per-operation timings in seconds"""
+    import shutil
+    import core
+    from design_system import generate_design_system
+
+    if name in ("search_cold", "search_disk", "search_warm"):
+        ops = [lambda q=q, d=d: core.search(q, d) for q, d in inputs["search"]]
+    elif name == "stack_warm":
+        ops = [lambda q=q, s=s: core.search_stack(q, s) for q, s in inputs["stack"]]
+    elif name == "search_all":
+        ops = [lambda q=q: core.search_all(q) for q, _ in inputs["search"]]
+    elif name == "design_system":
+        ops = [lambda q=q: generate_design_system(q, use_cache=False) for q in inputs["design"]]
+    elif name == "design_system_cached":
+        ops = [lambda q=q: generate_design_system(q) for q in inputs["design"]]
+    else:
+        raise ValueError(f"Unknown workload: {name}")
+
+    if name == "search_disk":
+        core.build_indexes()
+    elif name != "search_cold":
+        # Warm-up pass: fills the in-process caches, the persisted indexes and, for
+        # design_system_cached, the result cache
+        for op in ops:
+            op()
+
+    timings = []
+    for op in ops:
+        if name == "search_cold":
+            core.clear_caches()
+            shutil.rmtree(core.INDEX_DIR, ignore_errors=True)
+        elif name == "search_disk":
+            core.clear_caches()
+        start = time.perf_counter()
+        op()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _worker():
+    """--worker entry point: spec on stdin, summary JSON on stdout"""
+    spec = json.load(sys.stdin)
+    timings = run_workload(spec["workload"], spec["inputs"])
+    json.dump(summarize(timings, _peak_rss_kb()), sys.stdout)
+
+
+def run_isolated(name, inputs, data_dir, work_dir):
+    """Run one workload in a fresh interpreter against data_dir, with its own index and result cache in work_dir"""
+    env = dict(os.environ, UIPRO_DATA_DIR=str(data_dir),
+               UIPRO_INDEX_DIR=str(Path(work_dir) / "index"), UIPRO_CACHE_DIR=str(Path(work_dir) / "cache"))
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker"],
+        input=json.dumps({"workload": name, "inputs": inputs}),
+        capture_output=True, text=True, env=env
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Workload {name} failed:\n{proc.stderr}")
+    return json.loads(proc.stdout)
+
+
+# ============ BASELINE COMPARISON ============
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """Relative change per workload metric; latencies and throughput beyond threshold are regressions"""
+    comparison = {}
+    regressions = []
+    for name, stats in current["workloads"].items():
+        base = baseline.get("workloads", {}).get(name)
+        if not base:
+            continue
+        deltas = {}
+        for metric in ("p50_ms", "p95_ms", "p99_ms", "mean_ms", "throughput_ops", "peak_rss_kb"):
+            if stats.get(metric) is None or not base.get(metric):
+                continue
+            change = (stats[metric] - base[metric]) / base[metric]
+            deltas[metric] = round(change, 4)
+            worse = -change if metric == "throughput_ops" else change
+            if metric in ("p50_ms", "p95_ms", "throughput_ops") and worse > threshold:
+                regressions.append(f"{name}.{metric}")
+        comparison[name] = deltas
+    return {"threshold": threshold, "deltas": comparison, "regressions": regressions}
+
+
+# ============ MAIN ============
+def benchmark(rows=0, queries=DEFAULT_QUERIES, cold_queries=DEFAULT_COLD_QUERIES,
+              ds_queries=DEFAULT_DS_QUERIES, workloads=WORKLOADS, seed=0):
+    """Run the selected workloads and return the results document"""
+    with tempfile.TemporaryDirectory(prefix="uipro-bench-") as tmp:
+        data_dir = DATA_DIR
+        if rows:
+            data_dir = Path(tmp) / "data"
+            generate_corpus(data_dir, rows, seed)
+        inputs = make_queries(data_dir, queries, seed)
+
+        results = {}
+        for name in workloads:
+            limit = cold_queries if name in COLD_WORKLOADS else ds_queries if name in DS_WORKLOADS else queries
+            subset = {key: values[:limit] for key, values in inputs.items()}
+            results[name] = run_isolated(name, subset, data_dir, Path(tmp) / name)
+            print(f"{name}: p50 {results[name]['p50_ms']} ms, {results[name]['throughput_ops']} ops/s", file=sys.stderr)
+
+    return {
+        "meta": {
+            "rows": rows or "data",
+            "queries": queries,
+            "seed": seed,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")
+        },
+        "workloads": results
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UI Pro Max Benchmark")
+    parser.add_argument("--rows", type=int, default=0, help="Rows per synthetic domain/stack CSV (0 = shipped data)")
+    parser.add_argument("--queries", type=int, default=DEFAULT_QUERIES, help="Queries per warm workload")
+    parser.add_argument("--cold-queries", type=int, default=DEFAULT_COLD_QUERIES, help="Queries per cold workload")
+    parser.add_argument("--ds-queries", type=int, default=DEFAULT_DS_QUERIES, help="Queries for the design_system workloads")
+    parser.add_argument("--workloads", type=str, default=",".join(WORKLOADS), help="Comma-separated workloads to run")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the corpus and queries")
+    parser.add_argument("--output", "-o", type=str, default=None, help="Write results JSON here (default: stdout)")
+    parser.add_argument("--save-baseline", type=str, default=None, help="Also save the results as a baseline file")
+    parser.add_argument("--baseline", type=str, default=None, help="Compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Regression threshold (default: 0.10)")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker()
+        raise SystemExit(0)
+
+    selected = [name.strip() for name in args.workloads.split(",") if name.strip()]
+    unknown = [name for name in selected if name not in WORKLOADS]
+    if unknown:
+        parser.error(f"unknown workloads: {', '.join(unknown)} (choose from {', '.join(WORKLOADS)})")
+
+    report = benchmark(args.rows, args.queries, args.cold_queries, args.ds_queries, selected, args.seed)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            report["comparison"] = compare(report, json.load(f), args.threshold)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump({key: report[key] for key in ("meta", "workloads")}, f, indent=2)
+            f.write("\n")
+
+    if report.get("comparison", {}).get("regressions"):
+        print(f"Regressions: {', '.join(report['comparison']['regressions'])}", file=sys.stderr)
+        raise SystemExit(1)
@@ -5,69 +5,111 @@ UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
 """
 
 import csv
-import re
+import hashlib
+import heapq
+import json
+import os
+import sys
+import threading
 from pathlib import Path
 from math import log
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+
+from tokenizer import Tokenizer
+
+# NumPy is optional and costly to import, so it is loaded on first large corpus
+np = None
+_numpy_checked = False
 
 # ============ CONFIGURATION ============
-DATA_DIR = Path(__file__).parent.parent / "data"
+# $UIPRO_DATA_DIR / $UIPRO_INDEX_DIR point the engine at other corpora (see benchmark.py)
+DATA_DIR = Path(os.environ.get("UIPRO_DATA_DIR") or Path(__file__).parent.parent / "data")
+INDEX_DIR = Path(os.environ.get("UIPRO_INDEX_DIR") or Path(__file__).parent.parent / "index")
+INDEX_VERSION = 7
+GLOBAL_INDEX_FILE = "_global.json"  # Index over every domain and stack, in INDEX_DIR
 MAX_RESULTS = 3
+CACHE_SIZE = 32  # Entries per in-process cache (parsed rows, fitted indexes)
+NUMPY_MIN_DOCS = 2000  # Corpora at least this large use NumpyBM25 when NumPy is available
+PATCH_MAX_CHANGED = 0.5  # Patch a persisted index in place while at most this share of its rows changed
+
+# Tokenizer settings for every index; a domain may override them with its own
+# "tokenizer" entry in CSV_CONFIG (stacks: _STACK_COLS)
+DEFAULT_TOKENIZER = {"stem": True, "stopwords": True}
+
+# Domains with "field_weights" are scored with BM25F: each search column is a
+# field with its own weight and length normalization ("field_b", default below)
+BM25F_B = 0.75
+
+# Query terms missing from an index's vocabulary are expanded to the nearest
+# vocabulary terms: prefix completions first, then typos within the edit bound
+FUZZY_MIN_LEN = 4  # Shorter unknown terms are not expanded
+FUZZY_MAX_EXPANSIONS = 3
 
 CSV_CONFIG = {
     "style": {
         "file": "styles.csv",
         "search_cols": ["Style Category", "Keywords", "Best For", "Type"],
+        "field_weights": {"Style Category": 3.0, "Keywords": 2.0, "Best For": 1.5, "Type": 1.0},
         "output_cols": ["Style Category", "Type", "Keywords", "Primary Colors", "Effects & Animation", "Best For", "Performance", "Accessibility", "Framework Compatibility", "Complexity"]
     },
     "prompt": {
         "file": "prompts.csv",
         "search_cols": ["Style Category", "AI Prompt Keywords (Copy-Paste Ready)", "CSS/Technical Keywords"],
+        "field_weights": {"Style Category": 3.0, "AI Prompt Keywords (Copy-Paste Ready)": 1.5, "CSS/Technical Keywords": 1.0},
         "output_cols": ["Style Category", "AI Prompt Keywords (Copy-Paste Ready)", "CSS/Technical Keywords", "Implementation Checklist"]
     },
     "color": {
         "file": "colors.csv",
         "search_cols": ["Product Type", "Keywords", "Notes"],
+        "field_weights": {"Product Type": 3.0, "Keywords": 2.0, "Notes": 1.0},
         "output_cols": ["Product Type", "Keywords", "Primary (Hex)", "Secondary (Hex)", "CTA (Hex)", "Background (Hex)", "Text (Hex)", "Border (Hex)", "Notes"]
     },
     "chart": {
         "file": "charts.csv",
         "search_cols": ["Data Type", "Keywords", "Best Chart Type", "Accessibility Notes"],
+        "field_weights": {"Data Type": 3.0, "Keywords": 2.0, "Best Chart Type": 2.0, "Accessibility Notes": 1.0},
         "output_cols": ["Data Type", "Keywords", "Best Chart Type", "Secondary Options", "Color Guidance", "Accessibility Notes", "Library Recommendation", "Interactive Level"]
     },
     "landing": {
         "file": "landing.csv",
         "search_cols": ["Pattern Name", "Keywords", "Conversion Optimization", "Section Order"],
+        "field_weights": {"Pattern Name": 3.0, "Keywords": 2.0, "Conversion Optimization": 1.0, "Section Order": 1.0},
         "output_cols": ["Pattern Name", "Keywords", "Section Order", "Primary CTA Placement", "Color Strategy", "Conversion Optimization"]
     },
     "product": {
         "file": "products.csv",
         "search_cols": ["Product Type", "Keywords", "Primary Style Recommendation", "Key Considerations"],
+        "field_weights": {"Product Type": 3.0, "Keywords": 2.0, "Primary Style Recommendation": 1.5, "Key Considerations": 1.0},
         "output_cols": ["Product Type", "Keywords", "Primary Style Recommendation", "Secondary Styles", "Landing Page Pattern", "Dashboard Style (if applicable)", "Color Palette Focus"]
     },
     "ux": {
         "file": "ux-guidelines.csv",
         "search_cols": ["Category", "Issue", "Description", "Platform"],
+        "field_weights": {"Category": 2.0, "Issue": 3.0, "Description": 1.0, "Platform": 1.0},
         "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
     },
     "typography": {
         "file": "typography.csv",
         "search_cols": ["Font Pairing Name", "Category", "Mood/Style Keywords", "Best For", "Heading Font", "Body Font"],
+        "field_weights": {"Font Pairing Name": 3.0, "Category": 1.5, "Mood/Style Keywords": 2.0, "Best For": 1.5, "Heading Font": 1.0, "Body Font": 1.0},
         "output_cols": ["Font Pairing Name", "Category", "Heading Font", "Body Font", "Mood/Style Keywords", "Best For", "Google Fonts URL", "CSS Import", "Tailwind Config", "Notes"]
     },
     "icons": {
         "file": "icons.csv",
         "search_cols": ["Category", "Icon Name", "Keywords", "Best For"],
+        "field_weights": {"Category": 1.5, "Icon Name": 3.0, "Keywords": 2.0, "Best For": 1.0},
         "output_cols": ["Category", "Icon Name", "Keywords", "Library", "Import Code", "Usage", "Best For", "Style"]
     },
     "react": {
         "file": "react-performance.csv",
         "search_cols": ["Category", "Issue", "Keywords", "Description"],
+        "field_weights": {"Category": 1.5, "Issue": 3.0, "Keywords": 2.0, "Description": 1.0},
         "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
     },
     "web": {
         "file": "web-interface.csv",
         "search_cols": ["Category", "Issue", "Keywords", "Description"],
+        "field_weights": {"Category": 1.5, "Issue": 3.0, "Keywords": 2.0, "Description": 1.0},
         "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
     }
 }
@@ -90,169 +132,1111 @@ STACK_CONFIG = {
 # Common columns for all stacks
 _STACK_COLS = {
     "search_cols": ["Category", "Guideline", "Description", "Do", "Don't"],
+    "field_weights": {"Category": 1.5, "Guideline": 3.0, "Description": 1.0, "Do": 1.0, "Don't": 1.0},
     "output_cols": ["Category", "Guideline", "Description", "Do", "Don't", "Code Good", "Code Bad", "Severity", "Docs URL"]
 }
 
 AVAILABLE_STACKS = list(STACK_CONFIG.keys())
+STACK_PREFIX = "stack:"  # search_many() domain prefix for stack guidelines
 
 
 # ============ BM25 IMPLEMENTATION ============
 class BM25:
     """BM25 ranking algorithm for text search"""
 
-    def __init__(self, k1=1.5, b=0.75):
+    def __init__(self, k1=1.5, b=0.75, tokenizer=None):
         self.k1 = k1
         self.b = b
-        self.corpus = []
-        self.doc_lengths = []
+        self.tokenizer = tokenizer or Tokenizer()
+        # Raw index state, maintained by fit() and update()
+        self.raw_postings = {}
+        self.raw_lengths = []
+        # Scoring state derived from it by _refresh(), or restored by from_dict()
+        self.doc_lengths = []  # Only needed to derive norms: not restored
+        self.doc_norms = []
         self.avgdl = 0
         self.idf = {}
-        self.doc_freqs = defaultdict(int)
+        self.postings = {}
+        self.trigrams = None  # Built on the first unknown query token
+        self._expansions = {}
+        self._stale = False
         self.N = 0
 
     def tokenize(self, text):
         """Lowercase, split, remove punctuation, filter short words"""
-        text = re.sub(r'[^\w\s]', ' ', str(text).lower())
-        return [w for w in text.split() if len(w) > 2]
+        return self.tokenizer.tokenize(text)
+
+    def _analyze(self, doc):
+        """(term -> posting value, document length) for one document"""
+        tokens = self.tokenize(doc)
+        term_freqs = defaultdict(int)
+        for word in tokens:
+            term_freqs[word] += 1
+        return term_freqs, len(tokens)
 
     def fit(self, documents):
         """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
-        self.N = len(self.corpus)
-        if self.N == 0:
-            return
-        self.doc_lengths = [len(doc) for doc in self.corpus]
-        self.avgdl = sum(self.doc_lengths) / self.N
-
-        for doc in self.corpus:
-            seen = set()
-            for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
-
-        for word, freq in self.doc_freqs.items():
-            self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
+        # Inverted index: term -> [(doc_id, tf)], doc ids ascending
+        postings = defaultdict(list)
+        self.raw_lengths = []
+        for idx, doc in enumerate(documents):
+            values, length = self._analyze(doc)
+            self.raw_lengths.append(length)
+            for word, value in values.items():
+                postings[word].append((idx, value))
+        self.raw_postings = dict(postings)
+        self._refresh()
+
+    def update(self, changed=None, appended=()):
+        """
+        Patch a fitted index in place instead of refitting.
+
+        changed maps doc_id -> (old_doc, new_doc) for edited documents; the old
+        text tells which postings to drop. appended documents take the next
+        doc ids. Only these documents are re-tokenized: the statistics are not
+        adjusted incrementally but re-derived in full by _refresh() on the next
+        query. A BM25F index restored without its raw postings (see
+        _load_index) cannot be updated.
+        """
+        if self.raw_postings is None:
+            raise ValueError("update() needs the raw postings, which this index was loaded without")
+        for idx, (old_doc, new_doc) in (changed or {}).items():
+            old_values, _ = self._analyze(old_doc)
+            for word in old_values:
+                plist = self.raw_postings[word]
+                del plist[_posting_position(plist, idx)]
+                if not plist:
+                    del self.raw_postings[word]
+            values, self.raw_lengths[idx] = self._analyze(new_doc)
+            for word, value in values.items():
+                plist = self.raw_postings.setdefault(word, [])
+                plist.insert(_posting_position(plist, idx), (idx, value))
+
+        for doc in appended:
+            idx = len(self.raw_lengths)
+            values, length = self._analyze(doc)
+            self.raw_lengths.append(length)
+            for word, value in values.items():
+                self.raw_postings.setdefault(word, []).append((idx, value))
+
+        self._stale = True
+
+    def _ensure_fresh(self):
+        if self._stale:
+            self._refresh()
+
+    def _refresh(self):
+        """
+        Derive postings, document frequencies, IDF, average length and norms
+        from the raw index. This is a full pass over every posting
+        (no tokenization): IDF depends on N and BM25F pseudo frequencies on
+        the average field lengths, so any edit or append touches all of them.
+        """
+        self._stale = False
+        self.N = len(self.raw_lengths)
+        self._derive()
+        self.avgdl = sum(self.doc_lengths) / self.N if self.N else 0
+        self.idf = {word: log((self.N - len(plist) + 0.5) / (len(plist) + 0.5) + 1) for word, plist in self.postings.items()}
+        self.doc_norms = self._doc_norms()
+        self._finalize()
+
+    def _derive(self):
+        self.postings = self.raw_postings
+        self.doc_lengths = self.raw_lengths
+
+    def _finalize(self):
+        """Reset state built lazily from the scoring state (run after _refresh() and from_dict())"""
+        # Only unknown query tokens need the trigram index: drop it until then
+        self.trigrams = None
+        self._expansions = {}
+
+    def _doc_norms(self):
+        """Per-document length normalization: k1 * (1 - b + b * dl / avgdl)"""
+        avgdl = self.avgdl or 1
+        return [self.k1 * (1 - self.b + self.b * dl / avgdl) for dl in self.doc_lengths]
+
+    # ---- Fuzzy / prefix expansion ----
+    @staticmethod
+    def _grams(word, closed=True):
+        """Character trigrams of a word padded with "$" ("$$w ... d$" when closed)"""
+        padded = f"$${word}$" if closed else f"$${word}"
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def _trigram_index(self):
+        """Trigram -> vocabulary terms side index, used to find expansion candidates (built once)"""
+        if self.trigrams is None:
+            trigrams = defaultdict(list)
+            for word in self.postings:
+                for gram in self._grams(word):
+                    trigrams[gram].append(word)
+            self.trigrams = dict(trigrams)
+        return self.trigrams
+
+    def expand(self, token):
+        """
+        Vocabulary terms standing in for a query token (memoized).
+
+        Known tokens map to themselves. An unknown token of FUZZY_MIN_LEN+
+        characters maps to the vocabulary terms it is a prefix of or, failing
+        that, to the terms within 1 edit (2 edits for 8+ characters), at most
+        FUZZY_MAX_EXPANSIONS of them, most frequent first.
+        """
+        self._ensure_fresh()
+        if token in self.postings:
+            return (token,)
+        cached = self._expansions.get(token)
+        if cached is not None:
+            return cached
+        expansion = ()
+        if len(token) >= FUZZY_MIN_LEN and self.postings:
+            expansion = self._find_expansion(token)
+        if len(self._expansions) >= 4096:
+            self._expansions.clear()
+        self._expansions[token] = expansion
+        return expansion
+
+    def _find_expansion(self, token):
+        grams = self._grams(token, closed=False)
+        shared = defaultdict(int)
+        trigrams = self._trigram_index()
+        for gram in grams:
+            for word in trigrams.get(gram, ()):
+                shared[word] += 1
+        by_frequency = lambda word: (-len(self.postings[word]), word)
+
+        # A prefix shares all of its open-ended trigrams with the term
+        prefix_grams = len(grams)
+        completions = [w for w, n in shared.items() if n == prefix_grams and w.startswith(token)]
+        if completions:
+            return tuple(sorted(completions, key=by_frequency)[:FUZZY_MAX_EXPANSIONS])
+
+        # Each edit destroys at most three trigrams
+        max_edits = 1 if len(token) < 8 else 2
+        min_shared = prefix_grams - 3 * max_edits
+        matches = []
+        for word, n in shared.items():
+            if n >= min_shared and abs(len(word) - len(token)) <= max_edits:
+                distance = _edit_distance(token, word, max_edits)
+                if distance <= max_edits:
+                    matches.append((distance, word))
+        matches.sort(key=lambda m: (m[0],) + by_frequency(m[1]))
+        return tuple(word for _, word in matches[:FUZZY_MAX_EXPANSIONS])
+
+    def expand_tokens(self, query_tokens):
+        """Replace unknown query tokens with their expansions"""
+        expanded = []
+        for token in query_tokens:
+            expanded.extend(self.expand(token))
+        return expanded
+
+    def _accumulate(self, query_tokens):
+        """Flat list of BM25 scores, indexed by document id"""
+        self._ensure_fresh()
+        query_tokens = self.expand_tokens(query_tokens)
+        scores = [0.0] * self.N
+
+        # Only the postings of query terms are touched
+        k1_plus_1 = self.k1 + 1
+        for token in query_tokens:
+            plist = self.postings.get(token)
+            if not plist:
+                continue
+            idf = self.idf[token]
+            norms = self.doc_norms
+            for idx, tf in plist:
+                scores[idx] += idf * (tf * k1_plus_1) / (tf + norms[idx])
+
+        return scores
 
     def score(self, query):
         """Score all documents against query"""
-        query_tokens = self.tokenize(query)
-        scores = []
+        return sorted(enumerate(self._accumulate(self.tokenizer.tokenize_query(query))), key=lambda x: x[1], reverse=True)
+
+    def top_k(self, query, k):
+        """Return the k best (doc_id, score) pairs with score > 0, best first"""
+        return self.top_k_tokens(self.tokenizer.tokenize_query(query), k)
+
+    def top_k_tokens(self, query_tokens, k):
+        """top_k() for an already tokenized query"""
+        if k <= 0:
+            return []
+        hits = ((idx, score) for idx, score in enumerate(self._accumulate(query_tokens)) if score > 0)
+        # nlargest keeps document order among equal scores, like a stable sort
+        return heapq.nlargest(k, hits, key=lambda x: x[1])
+
+    def top_k_batch(self, queries, k):
+        """top_k() for several queries"""
+        return [self.top_k(query, k) for query in queries]
+
+    def to_dict(self):
+        """Serialize the raw index (for update()) and the scoring state derived from it"""
+        self._ensure_fresh()
+        state = {
+            "k1": self.k1,
+            "b": self.b,
+            "tokenizer": self.tokenizer.to_dict(),
+            "lengths": self.raw_lengths,
+            "postings": self.postings,
+            "avgdl": self.avgdl,
+            "idf": self.idf,
+            "norms": self.doc_norms
+        }
+        if self.postings is not self.raw_postings:
+            # BM25F: postings hold pseudo frequencies, the raw ones per-field counts
+            state["raw_postings"] = self.raw_postings
+        return state
+
+    @classmethod
+    def from_dict(cls, state, **kwargs):
+        """Restore a fitted index from to_dict() output as saved: nothing is re-derived until update()"""
+        bm25 = cls(state["k1"], state["b"], Tokenizer(**state["tokenizer"]), **kwargs)
+        bm25.raw_lengths = state["lengths"]
+        bm25.N = len(bm25.raw_lengths)
+        bm25.postings = state["postings"]
+        bm25.raw_postings = state.get("raw_postings", bm25.postings)
+        bm25.avgdl = state["avgdl"]
+        bm25.idf = state["idf"]
+        bm25.doc_norms = state["norms"]
+        bm25._finalize()
+        return bm25
+
+
+def _posting_position(plist, idx):
+    """Index of the first posting with doc id >= idx (postings are sorted by doc id)"""
+    lo, hi = 0, len(plist)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if plist[mid][0] < idx:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _edit_distance(a, b, limit):
+    """Levenshtein distance, giving up (returning limit + 1) once it exceeds limit"""
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class BM25F(BM25):
+    """
+    Field-weighted BM25 (BM25F) over several text fields per document.
+
+    Each field's term frequency is normalized by that field's length and scaled
+    by its weight; the sum becomes one pseudo term frequency per (term, doc).
+    Pseudo frequencies are derived from the raw per-field counts whenever the
+    statistics are refreshed, so scoring is the same single pass over postings
+    as BM25, with k1 as the per-document denominator.
+    """
+
+    def __init__(self, k1=1.5, b=0.75, tokenizer=None, weights=(), field_b=()):
+        super().__init__(k1, b, tokenizer)
+        self.weights = list(weights)
+        self.field_b = list(field_b)
+
+    def _analyze(self, fields):
+        """(term -> per-field tf list, per-field lengths) for one document given as one text per field"""
+        tokens = [self.tokenize(text) for text in fields]
+        term_freqs = defaultdict(lambda: [0] * len(tokens))
+        for f, field_tokens in enumerate(tokens):
+            for word in field_tokens:
+                term_freqs[word][f] += 1
+        return term_freqs, [len(field_tokens) for field_tokens in tokens]
+
+    def _derive(self):
+        n_fields = len(self.weights)
+        avg_field = [sum(lengths[f] for lengths in self.raw_lengths) / self.N if self.N else 0
+                     for f in range(n_fields)]
+        # Per-document weight / length-normalization factor of each field
+        units = []
+        for lengths in self.raw_lengths:
+            units.append([
+                self.weights[f] / (1 - self.field_b[f] + self.field_b[f] * lengths[f] / avg_field[f])
+                if lengths[f] else 0.0
+                for f in range(n_fields)
+            ])
+        self.postings = {
+            word: [(idx, sum(tf * units[idx][f] for f, tf in enumerate(tfs) if tf)) for idx, tfs in plist]
+            for word, plist in self.raw_postings.items()
+        }
+        self.doc_lengths = [sum(lengths) for lengths in self.raw_lengths]
+
+    def _doc_norms(self):
+        # Length normalization is already folded into the pseudo frequencies
+        return [self.k1] * self.N
+
+    def to_dict(self):
+        state = super().to_dict()
+        state["weights"] = self.weights
+        state["field_b"] = self.field_b
+        return state
+
+    @classmethod
+    def from_dict(cls, state):
+        bm25 = super().from_dict(state, weights=state["weights"], field_b=state["field_b"])
+        if "raw_postings" not in state:
+            bm25.raw_postings = None  # Scoring only; see _load_index
+        return bm25
+
+
+class NumpyBM25(BM25):
+    """
+    BM25 over a sparse term-document matrix, scored with NumPy array operations.
+
+    The postings are flattened into CSR arrays (indptr / doc ids / tf, one row
+    per term) next to a length-norm vector. Each per-document contribution is
+    the same float64 expression as in BM25, added in query-token order, so
+    scores are bit-identical to the pure-Python engine.
+    """
+
+    def _finalize(self):
+        """Build CSR arrays from the postings"""
+        if not _numpy_available():
+            raise ImportError("NumpyBM25 requires NumPy")
+        super()._finalize()
+        self.term_ids = {}
+        indptr = [0]
+        doc_ids = []
+        tfs = []
+        for term_id, (word, plist) in enumerate(self.postings.items()):
+            self.term_ids[word] = term_id
+            for idx, tf in plist:
+                doc_ids.append(idx)
+                tfs.append(tf)
+            indptr.append(len(doc_ids))
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        self.tfs = np.asarray(tfs, dtype=np.float64)
+        self.idf_vec = np.asarray([self.idf[word] for word in self.term_ids], dtype=np.float64)
+        self.norm_vec = np.asarray(self.doc_norms, dtype=np.float64)
+
+    def score_batch(self, queries):
+        """Score matrix of shape (len(queries), N)"""
+        return self._score_matrix([self.tokenizer.tokenize_query(query) for query in queries])
+
+    def _score_matrix(self, token_lists):
+        self._ensure_fresh()
+        scores = np.zeros((len(token_lists), self.N), dtype=np.float64)
+        k1_plus_1 = self.k1 + 1
+        for row, query_tokens in enumerate(token_lists):
+            for token in self.expand_tokens(query_tokens):
+                term_id = self.term_ids.get(token)
+                if term_id is None:
+                    continue
+                start, end = self.indptr[term_id], self.indptr[term_id + 1]
+                docs = self.doc_ids[start:end]
+                tf = self.tfs[start:end]
+                # Doc ids are unique within a postings row, so fancy-index add is safe
+                scores[row, docs] += self.idf_vec[term_id] * (tf * k1_plus_1) / (tf + self.norm_vec[docs])
+        return scores
+
+    def _accumulate(self, query_tokens):
+        return self._score_matrix([query_tokens])[0].tolist()
+
+    @staticmethod
+    def _select(scores, k):
+        """Top k positive entries of a score vector, ties in document order"""
+        candidates = np.flatnonzero(scores > 0)
+        values = scores[candidates]
+        if len(candidates) > k:
+            # Partial selection: keep everything tied with the k-th best value
+            threshold = np.partition(values, len(values) - k)[len(values) - k]
+            keep = values >= threshold
+            candidates, values = candidates[keep], values[keep]
+        order = np.argsort(-values, kind="stable")[:k]
+        return [(int(candidates[i]), float(values[i])) for i in order]
+
+    def top_k_tokens(self, query_tokens, k):
+        if k <= 0:
+            return []
+        return self._select(self._score_matrix([query_tokens])[0], k)
+
+    def top_k_batch(self, queries, k):
+        if k <= 0:
+            return [[] for _ in queries]
+        return [self._select(row, k) for row in self.score_batch(queries)]
+
+
+class NumpyBM25F(BM25F, NumpyBM25):
+    """BM25F scored with the NumpyBM25 array engine"""
+
+
+class GlobalBM25(BM25):
+    """
+    BM25 over documents pooled from several sources (domains and stacks).
+
+    IDF is global, but each document's length is normalized against the
+    average length of its own source, so a long stack guideline is not
+    penalized next to a short style entry. groups holds the source id of
+    every document.
+    """
+
+    def __init__(self, k1=1.5, b=0.75, tokenizer=None, groups=()):
+        super().__init__(k1, b, tokenizer)
+        self.groups = list(groups)
+
+    def _doc_norms(self):
+        totals = defaultdict(int)
+        counts = defaultdict(int)
+        for group, dl in zip(self.groups, self.doc_lengths):
+            totals[group] += dl
+            counts[group] += 1
+        avg = {group: (totals[group] / counts[group]) or 1 for group in counts}
+        return [self.k1 * (1 - self.b + self.b * dl / avg[group]) for group, dl in zip(self.groups, self.doc_lengths)]
+
+    def max_score(self, query_tokens):
+        """Upper bound of any document's score for the query (tf -> infinity)"""
+        return sum(self.idf[token] for token in self.expand_tokens(query_tokens)) * (self.k1 + 1)
+
+    def top_k_groups(self, query_tokens, k, groups=None):
+        """top_k_tokens() restricted to documents whose group is in groups (None = all)"""
+        if k <= 0:
+            return []
+        hits = ((idx, score) for idx, score in enumerate(self._accumulate(query_tokens))
+                if score > 0 and (groups is None or self.groups[idx] in groups))
+        return heapq.nlargest(k, hits, key=lambda x: x[1])
+
+    def to_dict(self):
+        state = super().to_dict()
+        state["groups"] = self.groups
+        return state
+
+    @classmethod
+    def from_dict(cls, state):
+        return super().from_dict(state, groups=state["groups"])
+
+
+class NumpyGlobalBM25(GlobalBM25, NumpyBM25):
+    """GlobalBM25 scored with the NumpyBM25 array engine"""
+
+
+def _numpy_available():
+    """Import NumPy on first use; False when it is not installed"""
+    global np, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+    return np is not None
+
+
+def _bm25_class(n_docs, fielded=False):
+    """Pick the scoring engine for a corpus of n_docs documents"""
+    if n_docs >= NUMPY_MIN_DOCS and _numpy_available():
+        return NumpyBM25F if fielded else NumpyBM25
+    return BM25F if fielded else BM25
+
+
+# ============ COLUMNAR STORAGE ============
+class Table:
+    """
+    Column-oriented CSV rows: one list per column instead of one dict per row.
+
+    Column names are interned and repeated cell values share one string object,
+    so a loaded domain costs a handful of lists rather than a dict per row.
+    Rows are addressed by index and only materialized as dicts on request.
+    """
+
+    def __init__(self, fieldnames, columns):
+        self.fieldnames = [sys.intern(name) for name in fieldnames]
+        self.columns = dict(zip(self.fieldnames, columns))
+        self.n_rows = len(columns[0]) if columns else 0
+
+    @classmethod
+    def from_csv(cls, filepath):
+        """Parse a CSV with csv.DictReader semantics (blank lines skipped, short rows padded with None)"""
+        with open(filepath, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            fieldnames = next(reader, [])
+            columns = [[] for _ in fieldnames]
+            pools = [{} for _ in fieldnames]
+            for record in reader:
+                if not record:
+                    continue
+                for col, pool, i in zip(columns, pools, range(len(fieldnames))):
+                    value = record[i] if i < len(record) else None
+                    col.append(pool.setdefault(value, value))
+        return cls(fieldnames, columns)
+
+    def __len__(self):
+        return self.n_rows
+
+    def value(self, col, idx, default=""):
+        """Cell value, or default when the column does not exist"""
+        column = self.columns.get(col)
+        return default if column is None else column[idx]
+
+    def row(self, idx, cols):
+        """Materialize one row as a dict restricted to cols (missing columns omitted)"""
+        return {col: self.columns[col][idx] for col in cols if col in self.columns}
+
+    def field_texts(self, idx, cols):
+        """Searchable text of one row, one string per column (for BM25F)"""
+        return [str(self.value(col, idx)) for col in cols]
+
+    def document(self, idx, cols):
+        """Searchable text of one row: the given columns joined by spaces"""
+        return " ".join(self.field_texts(idx, cols))
+
+    def row_hash(self, idx, cols):
+        """Short digest of one row's values in cols"""
+        text = "\x1f".join(self.field_texts(idx, cols))
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+    def to_dict(self):
+        return {"fieldnames": self.fieldnames, "columns": [self.columns[name] for name in self.fieldnames]}
+
+    @classmethod
+    def from_dict(cls, state):
+        columns = []
+        for column in state["columns"]:
+            pool = {}
+            columns.append([pool.setdefault(value, value) for value in column])
+        return cls(state["fieldnames"], columns)
+
+
+# ============ IN-PROCESS CACHE ============
+class LRUCache:
+    """Bounded least-recently-used mapping with hit/miss counters; safe to share between threads"""
 
-        for idx, doc in enumerate(self.corpus):
-            score = 0
-            doc_len = self.doc_lengths[idx]
-            term_freqs = defaultdict(int)
-            for word in doc:
-                term_freqs[word] += 1
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
 
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
 
-            scores.append((idx, score))
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
 
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+    def clear(self):
+        """Drop all entries and reset counters"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "maxsize": self.maxsize}
+
+
+# Keyed by (path, mtime_ns, size[, search_cols]) so an edited file is a miss.
+# INDEX_CACHE holds (Table, BM25) pairs; ROWS_CACHE holds _load_csv() dict rows.
+ROWS_CACHE = LRUCache()
+INDEX_CACHE = LRUCache()
+
+
+def _cache_key(filepath, stat):
+    return (str(filepath.resolve()), stat.st_mtime_ns, stat.st_size)
+
+
+def cache_stats():
+    """Hit/miss counters for the in-process caches"""
+    return {"rows": ROWS_CACHE.stats(), "indexes": INDEX_CACHE.stats()}
+
+
+def clear_caches():
+    """Forget all parsed rows and fitted indexes held by this process"""
+    ROWS_CACHE.clear()
+    INDEX_CACHE.clear()
+
+
+# ============ PERSISTENT INDEX ============
+def _content_hash(filepath):
+    """SHA-256 of file contents"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _index_path(filepath):
+    """Location of the serialized index for a data CSV"""
+    try:
+        name = filepath.resolve().relative_to(DATA_DIR.resolve()).as_posix()
+    except ValueError:
+        name = hashlib.sha1(str(filepath.resolve()).encode('utf-8')).hexdigest()[:12] + "-" + filepath.name
+    return INDEX_DIR / (name.replace("/", "__") + ".json")
+
+
+def _write_index(path, payload):
+    """Write index atomically; a read-only install just skips persistence"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per thread too: searches may run concurrently in a pool
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def _index_spec(config):
+    """What an index is built from: search columns, tokenizer and field weighting"""
+    spec = {
+        "search_cols": list(config["search_cols"]),
+        "tokenizer": {**DEFAULT_TOKENIZER, **config.get("tokenizer", {})}
+    }
+    weights = config.get("field_weights")
+    if weights:
+        field_b = config.get("field_b", {})
+        spec["field_weights"] = [weights.get(col, 1.0) for col in config["search_cols"]]
+        spec["field_b"] = [field_b.get(col, BM25F_B) for col in config["search_cols"]]
+    return spec
+
+
+def _index_input(table, idx, spec):
+    """What the index for spec is fitted on for one row"""
+    if "field_weights" in spec:
+        return table.field_texts(idx, spec["search_cols"])
+    return table.document(idx, spec["search_cols"])
+
+
+def _fit_index(table, spec):
+    """Fit a fresh BM25 / BM25F index over a Table"""
+    tokenizer = Tokenizer(**spec["tokenizer"])
+    if "field_weights" in spec:
+        bm25 = _bm25_class(len(table), fielded=True)(
+            tokenizer=tokenizer, weights=spec["field_weights"], field_b=spec["field_b"])
+    else:
+        bm25 = _bm25_class(len(table))(tokenizer=tokenizer)
+    bm25.fit([_index_input(table, idx, spec) for idx in range(len(table))])
+    return bm25
+
+
+def _raw_path(path):
+    """Sidecar of an index file with the BM25F raw postings, only read to patch the index"""
+    return path.with_name(path.name[:-len(".json")] + ".raw.json")
+
+
+def _patch_index(payload, table, spec, path):
+    """
+    Bring a persisted index up to date with an edited CSV without refitting.
+
+    Rows are matched by position and compared by row hash: edited rows are
+    re-indexed and appended rows added. Returns (index, row hashes), or None
+    when rows were removed or too many changed, or a BM25F index's raw
+    postings are missing, in which case a full rebuild is the better deal.
+    """
+    old_hashes = payload["row_hashes"]
+    new_hashes = [table.row_hash(idx, spec["search_cols"]) for idx in range(len(table))]
+    if len(new_hashes) < len(old_hashes):
+        return None
+    changed = [idx for idx, (old, new) in enumerate(zip(old_hashes, new_hashes)) if old != new]
+    if len(changed) > PATCH_MAX_CHANGED * len(old_hashes):
+        return None
+
+    state = payload["bm25"]
+    if "weights" in state:
+        try:
+            with open(_raw_path(path), 'r', encoding='utf-8') as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if raw.get("sha256") != payload["source"]["sha256"]:
+            return None
+        state = dict(state, raw_postings=raw["postings"])
+    old_table = Table.from_dict(payload["table"])
+    bm25 = _bm25_class(len(table), "weights" in state).from_dict(state)
+    bm25.update(
+        {idx: (_index_input(old_table, idx, spec), _index_input(table, idx, spec)) for idx in changed},
+        [_index_input(table, idx, spec) for idx in range(len(old_hashes), len(table))]
+    )
+    # Derive now rather than on first query, before the index is shared between threads
+    bm25._ensure_fresh()
+    return bm25, new_hashes
+
+
+def _load_index(filepath, spec):
+    """
+    Return (Table, fitted index) for a CSV, reusing the on-disk index when valid.
+
+    The index file holds the scoring state, restored without re-deriving
+    anything; a BM25F index keeps its raw per-field postings, needed only to
+    patch it, in a .raw.json sidecar.
+
+    The index is trusted while the CSV's mtime and size are unchanged. If they
+    differ, the content hash decides: an identical hash only refreshes the
+    stored stat, an edit or append is patched into the index (re-tokenizing
+    only the changed rows; the statistics are re-derived in full), anything
+    else (removed rows, a rewrite, a different spec) triggers a rebuild.
+    """
+    stat = filepath.stat()
+    key = _cache_key(filepath, stat) + (json.dumps(spec, sort_keys=True),)
+    cached = INDEX_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    path = _index_path(filepath)
+    payload = None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    table = bm25 = row_hashes = digest = None
+    if payload and payload.get("version") == INDEX_VERSION and payload.get("spec") == spec:
+        source = payload["source"]
+        fresh = source["mtime_ns"] == stat.st_mtime_ns and source["size"] == stat.st_size
+        if not fresh:
+            digest = _content_hash(filepath)
+        if not fresh and source["sha256"] == digest:
+            source["mtime_ns"], source["size"] = stat.st_mtime_ns, stat.st_size
+            _write_index(path, payload)
+            fresh = True
+        if fresh:
+            table = Table.from_dict(payload["table"])
+            state = payload["bm25"]
+            loaded = (table, _bm25_class(len(table), "weights" in state).from_dict(state))
+            INDEX_CACHE.put(key, loaded)
+            return loaded
+
+        table = Table.from_csv(filepath)
+        patched = _patch_index(payload, table, spec, path)
+        if patched:
+            bm25, row_hashes = patched
+
+    if bm25 is None:
+        table = table or Table.from_csv(filepath)
+        bm25 = _fit_index(table, spec)
+        row_hashes = [table.row_hash(idx, spec["search_cols"]) for idx in range(len(table))]
+
+    digest = digest or _content_hash(filepath)
+    state = bm25.to_dict()
+    raw_postings = state.pop("raw_postings", None)
+    if raw_postings is not None:
+        _write_index(_raw_path(path), {"sha256": digest, "postings": raw_postings})
+    _write_index(path, {
+        "version": INDEX_VERSION,
+        "spec": spec,
+        "source": {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest},
+        "table": table.to_dict(),
+        "row_hashes": row_hashes,
+        "bm25": state
+    })
+    INDEX_CACHE.put(key, (table, bm25))
+    return table, bm25
+
+
+def build_indexes():
+    """Prebuild the on-disk index for every domain and stack CSV, plus the global index"""
+    targets = [(DATA_DIR / cfg["file"], _index_spec(cfg)) for cfg in CSV_CONFIG.values()]
+    targets += [(DATA_DIR / cfg["file"], _index_spec(_STACK_COLS)) for cfg in STACK_CONFIG.values()]
+    built = []
+    for filepath, spec in targets:
+        if filepath.exists():
+            _load_index(filepath, spec)
+            built.append(_index_path(filepath))
+    _load_global_index()
+    built.append(INDEX_DIR / GLOBAL_INDEX_FILE)
+    return built
+
+
+# ============ GLOBAL INDEX ============
+def _sources():
+    """Every searchable source as (name, CSV path, config): domains, then "stack:<name>" stacks"""
+    for domain, config in CSV_CONFIG.items():
+        yield domain, DATA_DIR / config["file"], config
+    for stack, config in STACK_CONFIG.items():
+        yield STACK_PREFIX + stack, DATA_DIR / config["file"], _STACK_COLS
+
+
+def _load_global_index():
+    """
+    Return (sources, tables, GlobalBM25) over every domain and stack CSV.
+
+    sources lists (name, config) per group id. The index is fitted in one pass
+    over all rows with DEFAULT_TOKENIZER, persisted as GLOBAL_INDEX_FILE and
+    rebuilt whenever any source CSV's mtime or size changes.
+    """
+    available = [(name, filepath, config) for name, filepath, config in _sources() if filepath.exists()]
+    fingerprint = []
+    for name, filepath, _ in available:
+        stat = filepath.stat()
+        fingerprint.append([name, stat.st_mtime_ns, stat.st_size])
+    key = ("global", json.dumps(fingerprint), json.dumps(DEFAULT_TOKENIZER, sort_keys=True))
+    cached = INDEX_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    sources = [(name, config) for name, _, config in available]
+    path = INDEX_DIR / GLOBAL_INDEX_FILE
+    payload = None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    if (payload and payload.get("version") == INDEX_VERSION and payload.get("sources") == fingerprint
+            and payload.get("tokenizer") == DEFAULT_TOKENIZER):
+        tables = [Table.from_dict(state) for state in payload["tables"]]
+        state = payload["bm25"]
+        engine = NumpyGlobalBM25 if len(state["lengths"]) >= NUMPY_MIN_DOCS and _numpy_available() else GlobalBM25
+        loaded = (sources, tables, engine.from_dict(state))
+        INDEX_CACHE.put(key, loaded)
+        return loaded
+
+    tables = [Table.from_csv(filepath) for _, filepath, _ in available]
+    documents, groups = [], []
+    for group, (table, (_, config)) in enumerate(zip(tables, sources)):
+        for idx in range(len(table)):
+            documents.append(table.document(idx, config["search_cols"]))
+            groups.append(group)
+    engine = NumpyGlobalBM25 if len(documents) >= NUMPY_MIN_DOCS and _numpy_available() else GlobalBM25
+    bm25 = engine(tokenizer=Tokenizer(**DEFAULT_TOKENIZER), groups=groups)
+    bm25.fit(documents)
+
+    _write_index(path, {
+        "version": INDEX_VERSION,
+        "sources": fingerprint,
+        "tokenizer": DEFAULT_TOKENIZER,
+        "tables": [table.to_dict() for table in tables],
+        "bm25": bm25.to_dict()
+    })
+    loaded = (sources, tables, bm25)
+    INDEX_CACHE.put(key, loaded)
+    return loaded
 
 
 # ============ SEARCH FUNCTIONS ============
 def _load_csv(filepath):
-    """Load CSV and return list of dicts"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return list(csv.DictReader(f))
+    """Load CSV and return list of dicts (cached per process; do not mutate)"""
+    filepath = Path(filepath)
+    key = _cache_key(filepath, filepath.stat())
+    rows = ROWS_CACHE.get(key)
+    if rows is None:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        ROWS_CACHE.put(key, rows)
+    return rows
 
 
-def _search_csv(filepath, search_cols, output_cols, query, max_results):
-    """Core search function using BM25"""
-    if not filepath.exists():
-        return []
+def _project(table, hits, output_cols):
+    """Materialize output columns for ranked hits only"""
+    return [table.row(idx, output_cols) for idx, _ in hits]
 
-    data = _load_csv(filepath)
 
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
+# ============ DOMAIN DETECTION ============
+DOMAIN_KEYWORDS = {
+    "color": ["color", "palette", "hex", "#", "rgb"],
+    "chart": ["chart", "graph", "visualization", "trend", "bar", "pie", "scatter", "heatmap", "funnel"],
+    "landing": ["landing", "page", "cta", "conversion", "hero", "testimonial", "pricing", "section"],
+    "product": ["saas", "ecommerce", "e-commerce", "fintech", "healthcare", "gaming", "portfolio", "crypto", "dashboard"],
+    "prompt": ["prompt", "css", "implementation", "variable", "checklist", "tailwind"],
+    "style": ["style", "design", "ui", "minimalism", "glassmorphism", "neumorphism", "brutalism", "dark mode", "flat", "aurora"],
+    "ux": ["ux", "usability", "accessibility", "wcag", "touch", "scroll", "animation", "keyboard", "navigation", "mobile"],
+    "typography": ["font", "typography", "heading", "serif", "sans"],
+    "icons": ["icon", "icons", "lucide", "heroicons", "symbol", "glyph", "pictogram", "svg icon"],
+    "react": ["react", "next.js", "nextjs", "suspense", "memo", "usecallback", "useeffect", "rerender", "bundle", "waterfall", "barrel", "dynamic import", "rsc", "server component"],
+    "web": ["aria", "focus", "outline", "semantic", "virtualize", "autocomplete", "form", "input type", "preconnect"]
+}
+DEFAULT_DOMAIN = "style"
+_KEYWORD_END = ""  # Trie key marking "a keyword ends here"
 
-    # BM25 search
-    bm25 = BM25()
-    bm25.fit(documents)
-    ranked = bm25.score(query)
 
-    # Get top results with score > 0
-    results = []
-    for idx, score in ranked[:max_results]:
-        if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
+def _build_keyword_trie(domain_keywords):
+    """Character trie over all keywords; terminal nodes list (keyword, domain) pairs"""
+    trie = {}
+    for domain, keywords in domain_keywords.items():
+        for kw in keywords:
+            node = trie
+            for ch in kw:
+                node = node.setdefault(ch, {})
+            node.setdefault(_KEYWORD_END, []).append((kw, domain))
+    return trie
 
-    return results
+
+_KEYWORD_TRIE = _build_keyword_trie(DOMAIN_KEYWORDS)
+
+
+def rank_domains(query):
+    """
+    Rank domains by how many of their keywords occur in the query.
+
+    One scan of the query against a prebuilt keyword trie finds every keyword
+    occurrence (substring semantics, as before). Returns [(domain, confidence)]
+    for matching domains, best first, where confidence is the domain's share
+    of all keyword hits. Ties keep DOMAIN_KEYWORDS order.
+    """
+    text = query.lower()
+    found = set()
+    for start in range(len(text)):
+        node = _KEYWORD_TRIE.get(text[start])
+        pos = start + 1
+        while node is not None:
+            found.update(node.get(_KEYWORD_END, ()))
+            node = node.get(text[pos]) if pos < len(text) else None
+            pos += 1
+
+    scores = dict.fromkeys(DOMAIN_KEYWORDS, 0)
+    for _, domain in found:
+        scores[domain] += 1
+    total = sum(scores.values())
+    ranked = sorted((item for item in scores.items() if item[1] > 0), key=lambda x: x[1], reverse=True)
+    return [(domain, score / total) for domain, score in ranked]
 
 
 def detect_domain(query):
     """Auto-detect the most relevant domain from query"""
-    query_lower = query.lower()
-
-    domain_keywords = {
-        "color": ["color", "palette", "hex", "#", "rgb"],
-        "chart": ["chart", "graph", "visualization", "trend", "bar", "pie", "scatter", "heatmap", "funnel"],
-        "landing": ["landing", "page", "cta", "conversion", "hero", "testimonial", "pricing", "section"],
-        "product": ["saas", "ecommerce", "e-commerce", "fintech", "healthcare", "gaming", "portfolio", "crypto", "dashboard"],
-        "prompt": ["prompt", "css", "implementation", "variable", "checklist", "tailwind"],
-        "style": ["style", "design", "ui", "minimalism", "glassmorphism", "neumorphism", "brutalism", "dark mode", "flat", "aurora"],
-        "ux": ["ux", "usability", "accessibility", "wcag", "touch", "scroll", "animation", "keyboard", "navigation", "mobile"],
-        "typography": ["font", "typography", "heading", "serif", "sans"],
-        "icons": ["icon", "icons", "lucide", "heroicons", "symbol", "glyph", "pictogram", "svg icon"],
-        "react": ["react", "next.js", "nextjs", "suspense", "memo", "usecallback", "useeffect", "rerender", "bundle", "waterfall", "barrel", "dynamic import", "rsc", "server component"],
-        "web": ["aria", "focus", "outline", "semantic", "virtualize", "autocomplete", "form", "input type", "preconnect"]
-    }
+    ranked = rank_domains(query)
+    return ranked[0][0] if ranked else DEFAULT_DOMAIN
 
-    scores = {domain: sum(1 for kw in keywords if kw in query_lower) for domain, keywords in domain_keywords.items()}
-    best = max(scores, key=scores.get)
-    return best if scores[best] > 0 else "style"
 
-
-def search(query, domain=None, max_results=MAX_RESULTS):
-    """Main search function with auto-domain detection"""
-    if domain is None:
-        domain = detect_domain(query)
+def _target(domain):
+    """Resolve a search_many() domain to its CSV, columns and result header"""
+    if domain.startswith(STACK_PREFIX):
+        stack = domain[len(STACK_PREFIX):]
+        if stack not in STACK_CONFIG:
+            return {"error": {"error": f"Unknown stack: {stack}. Available: {', '.join(AVAILABLE_STACKS)}"}}
+        file = STACK_CONFIG[stack]["file"]
+        filepath = DATA_DIR / file
+        if not filepath.exists():
+            return {"error": {"error": f"Stack file not found: {filepath}", "stack": stack}}
+        return {
+            "header": {"domain": "stack", "stack": stack},
+            "file": file,
+            "filepath": filepath,
+            "output_cols": _STACK_COLS["output_cols"],
+            "spec": _index_spec(_STACK_COLS)
+        }
 
     config = CSV_CONFIG.get(domain, CSV_CONFIG["style"])
     filepath = DATA_DIR / config["file"]
-
     if not filepath.exists():
-        return {"error": f"File not found: {filepath}", "domain": domain}
-
-    results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results)
-
+        return {"error": {"error": f"File not found: {filepath}", "domain": domain}}
     return {
-        "domain": domain,
-        "query": query,
+        "header": {"domain": domain},
         "file": config["file"],
-        "count": len(results),
-        "results": results
+        "filepath": filepath,
+        "output_cols": config["output_cols"],
+        "spec": _index_spec(config)
     }
 
 
+def search_many(requests):
+    """
+    Run a batch of searches, loading each domain's index once.
+
+    requests: iterable of (query, domain, max_results). domain is a CSV_CONFIG
+    key, None to auto-detect, or "stack:<name>" for stack guidelines.
+    Returns one search()/search_stack() style dict per request, in input order.
+    """
+    requests = list(requests)
+    responses = [None] * len(requests)
+
+    groups = defaultdict(list)
+    for i, (query, domain, max_results) in enumerate(requests):
+        if domain is None:
+            domain = detect_domain(query)
+        groups[domain].append((i, query, max_results))
+
+    for domain, items in groups.items():
+        target = _target(domain)
+        if "error" in target:
+            for i, _, _ in items:
+                responses[i] = dict(target["error"])
+            continue
+
+        table, bm25 = _load_index(target["filepath"], target["spec"])
+        for i, query, max_results in items:
+            # Query tokenization is memoized per tokenizer setting
+            tokens = bm25.tokenizer.tokenize_query(query)
+            results = _project(table, bm25.top_k_tokens(tokens, max_results), target["output_cols"])
+            responses[i] = {
+                **target["header"],
+                "query": query,
+                "file": target["file"],
+                "count": len(results),
+                "results": results
+            }
+
+    return responses
+
+
+def search(query, domain=None, max_results=MAX_RESULTS):
+    """Main search function with auto-domain detection"""
+    return search_many([(query, domain, max_results)])[0]
+
+
 def search_stack(query, stack, max_results=MAX_RESULTS):
     """Search stack-specific guidelines"""
-    if stack not in STACK_CONFIG:
-        return {"error": f"Unknown stack: {stack}. Available: {', '.join(AVAILABLE_STACKS)}"}
+    return search_many([(query, STACK_PREFIX + stack, max_results)])[0]
 
-    filepath = DATA_DIR / STACK_CONFIG[stack]["file"]
 
-    if not filepath.exists():
-        return {"error": f"Stack file not found: {filepath}", "stack": stack}
+def search_domains(query, top_n=2, max_results=MAX_RESULTS):
+    """Fan a query out to its top_n detected domains in one batch"""
+    ranked = rank_domains(query)[:top_n] or [(DEFAULT_DOMAIN, 0.0)]
+    responses = search_many([(query, domain, max_results) for domain, _ in ranked])
+    for (_, confidence), response in zip(ranked, responses):
+        response["confidence"] = round(confidence, 3)
+    return responses
 
-    results = _search_csv(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], query, max_results)
+
+def search_all(query, max_results=MAX_RESULTS, sources=None):
+    """
+    Search every domain and stack at once through the global index.
+
+    sources optionally restricts the search to some domains and/or
+    "stack:<name>" stacks. Hits are merged into one top-k list; each carries
+    its domain (and stack), source file, a score normalized to 0..1 against
+    the query's maximum attainable score, and its output columns.
+    """
+    names, tables, bm25 = _load_global_index()
+    allowed = None
+    if sources is not None:
+        allowed = {group for group, (name, _) in enumerate(names) if name in set(sources)}
+
+    tokens = bm25.tokenizer.tokenize_query(query)
+    bound = bm25.max_score(tokens) or 1
+    offsets = [0]
+    for table in tables:
+        offsets.append(offsets[-1] + len(table))
+
+    results = []
+    for idx, score in bm25.top_k_groups(tokens, max_results, allowed):
+        group = bm25.groups[idx]
+        name, config = names[group]
+        hit = {"domain": "stack", "stack": name[len(STACK_PREFIX):]} if name.startswith(STACK_PREFIX) else {"domain": name}
+        hit["file"] = (STACK_CONFIG[hit["stack"]] if "stack" in hit else CSV_CONFIG[name])["file"]
+        hit["score"] = round(score / bound, 4)
+        hit["result"] = tables[group].row(idx - offsets[group], config["output_cols"])
+        results.append(hit)
 
     return {
-        "domain": "stack",
-        "stack": stack,
+        "domain": "all",
         "query": query,
-        "file": STACK_CONFIG[stack]["file"],
+        "sources": list(sources) if sources is not None else "all",
         "count": len(results),
         "results": results
     }
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Search Daemon - keeps every domain index warm behind a Unix socket
+
+Usage: python search.py --serve [--socket PATH]
+       python search.py "<query>" ...          (uses the daemon when it is running)
+
+Protocol: JSON lines. One request object per line, one response line each:
+  {"op": "search", "query": "...", "domain": null, "max_results": 3}
+  {"op": "search_stack", "query": "...", "stack": "react", "max_results": 3}
+  {"op": "search_domains", "query": "...", "top_n": 2, "max_results": 3}
+  {"op": "search_all", "query": "...", "sources": null, "max_results": 3}
+  {"op": "design_system", "query": "...", "project_name": null, "output_format": "ascii",
+   "persist": false, "page": null, "pages": null, "output_dir": "/abs/path", "use_cache": true}
+  {"op": "cache_stats"}
+  {"op": "ping"}
+Response: {"ok": true, "result": ...} or {"ok": false, "error": "..."}
+
+Socket: $XDG_RUNTIME_DIR/uipro-search.sock, else <tempdir>/uipro-search-<uid>/search.sock
+(a 0700 directory). Clients only connect to a socket owned by the current user
+in a directory no one else can write to.
+"""
+
+import json
+import os
+import socket
+# Server-only and rarely needed modules are imported inside functions so the
+# client path of search.py stays cheap to start
+
+# ============ CONFIGURATION ============
+SOCKET_ENV = "UIPRO_SEARCH_SOCKET"
+CLIENT_TIMEOUT = 30  # Seconds; design-system generation is the slowest op
+
+
+def default_socket_path():
+    """Per-user socket path, overridable with $UIPRO_SEARCH_SOCKET"""
+    if os.environ.get(SOCKET_ENV):
+        return os.environ[SOCKET_ENV]
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        return os.path.join(os.environ["XDG_RUNTIME_DIR"], "uipro-search.sock")
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    if os.name == "posix":
+        # tempfile.gettempdir() without importing tempfile (and random, shutil...)
+        tmp = next((os.environ[name] for name in ("TMPDIR", "TEMP", "TMP") if os.environ.get(name)), "/tmp")
+    else:
+        import tempfile
+        tmp = tempfile.gettempdir()
+    return os.path.join(tmp, f"uipro-search-{uid}", "search.sock")
+
+
+def check_socket_dir(socket_path):
+    """Raise DaemonError unless the socket's directory is ours and not group- or world-writable"""
+    directory = os.path.dirname(os.path.abspath(socket_path))
+    st = os.stat(directory)
+    if st.st_uid != os.getuid() or st.st_mode & 0o022:
+        raise DaemonError(f"refusing to use {socket_path}: {directory} is not a private directory "
+                          f"(owner uid {st.st_uid}, mode {st.st_mode & 0o777:o})")
+
+
+# ============ REQUEST HANDLING ============
+def execute(request):
+    """Execute one protocol request in this process and return its result"""
+    op = request.get("op")
+    if op == "ping":
+        return "pong"
+    if op == "search":
+        from core import MAX_RESULTS, search
+        return search(request["query"], request.get("domain"), request.get("max_results", MAX_RESULTS))
+    if op == "search_stack":
+        from core import MAX_RESULTS, search_stack
+        return search_stack(request["query"], request["stack"], request.get("max_results", MAX_RESULTS))
+    if op == "search_domains":
+        from core import MAX_RESULTS, search_domains
+        return search_domains(request["query"], request.get("top_n", 2), request.get("max_results", MAX_RESULTS))
+    if op == "search_all":
+        from core import MAX_RESULTS, search_all
+        return search_all(request["query"], request.get("max_results", MAX_RESULTS), request.get("sources"))
+    if op == "design_system":
+        from design_system import generate_design_system
+        return generate_design_system(
+            request["query"],
+            request.get("project_name"),
+            request.get("output_format", "ascii"),
+            persist=request.get("persist", False),
+            page=request.get("page"),
+            output_dir=request.get("output_dir"),
+            pages=request.get("pages"),
+            use_cache=request.get("use_cache", True)
+        )
+    if op == "cache_stats":
+        from design_system import cache_stats
+        return cache_stats()
+    raise ValueError(f"Unknown op: {op}")
+
+
+# ============ CLIENT ============
+class DaemonUnavailable(OSError):
+    """No daemon is listening on the socket"""
+
+
+class DaemonError(RuntimeError):
+    """The socket is unsafe to use, or the daemon failed to answer the request"""
+
+
+def call(request, socket_path=None, timeout=CLIENT_TIMEOUT):
+    """
+    Send one request to the daemon and return its result.
+
+    Raises DaemonUnavailable when no daemon is listening (callers fall back to
+    execute()), DaemonError when the socket is not private to this user, the
+    daemon times out or drops the connection, or it reports a failure.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise DaemonUnavailable("Unix sockets are not available on this platform")
+    socket_path = socket_path or default_socket_path()
+    try:
+        owner = os.stat(socket_path).st_uid
+    except FileNotFoundError as e:
+        raise DaemonUnavailable(f"no daemon socket at {socket_path}") from e
+    check_socket_dir(socket_path)
+    if owner != os.getuid():
+        raise DaemonError(f"refusing to use {socket_path}: owned by uid {owner}")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(socket_path)
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            raise DaemonUnavailable(f"no daemon listening on {socket_path}") from e
+        # Past this point the daemon may have started the request: never retry it elsewhere
+        try:
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as reader:
+                line = reader.readline()
+        except socket.timeout as e:
+            raise DaemonError(f"no reply from the daemon on {socket_path} within {timeout}s") from e
+        except OSError as e:
+            raise DaemonError(f"lost the connection to the daemon on {socket_path}: {e}") from e
+    if not line:
+        raise DaemonError(f"the daemon on {socket_path} closed the connection")
+    response = json.loads(line)
+    if not response.get("ok"):
+        raise DaemonError(response.get("error", "unknown error"))
+    return response["result"]
+
+
+# ============ SERVER ============
+def serve(socket_path=None):
+    """Warm all indexes, then answer requests until interrupted"""
+    import signal
+    import socketserver
+    import sys
+    from core import build_indexes
+
+    if not hasattr(socket, "AF_UNIX"):
+        raise SystemExit("Error: --serve needs Unix domain sockets")
+
+    socket_path = socket_path or default_socket_path()
+    os.makedirs(os.path.dirname(os.path.abspath(socket_path)), mode=0o700, exist_ok=True)
+    try:
+        call({"op": "ping"}, socket_path, timeout=1)
+        raise SystemExit(f"Error: a daemon is already listening on {socket_path}")
+    except DaemonUnavailable:
+        # Nothing answering: a leftover socket file is stale
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+    except DaemonError as e:
+        raise SystemExit(f"Error: {e}")
+
+    build_indexes()
+    # Each connection gets its own thread and requests run concurrently, so a
+    # slow design_system request does not hold up searches: core's caches
+    # lock internally and index files are written atomically
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                try:
+                    response = {"ok": True, "result": execute(json.loads(line))}
+                except Exception as e:
+                    response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                self.wfile.flush()
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    old_umask = os.umask(0o077)
+    try:
+        server = Server(socket_path, Handler)
+    finally:
+        os.umask(old_umask)
+
+    # SIGTERM unwinds like Ctrl-C so the socket file is removed
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"UI Pro Max search daemon listening on {socket_path}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
@@ -11,14 +11,21 @@ Usage:
     # With persistence (Master + Overrides pattern)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True, page="dashboard")
+
+    # Page batch: one design system, overrides for many pages
+    result = generate_design_system("SaaS dashboard", "My Project", persist=True, pages=["dashboard", "settings"])
+
+Results are cached on disk (see ResultCache); pass use_cache=False to bypass it.
 """
 
-import csv
+import hashlib
 import json
 import os
+import threading
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
-from core import search, DATA_DIR
+from core import search, search_many, _load_csv, _index_spec, CSV_CONFIG, DATA_DIR, INDEX_VERSION
 
 
 # ============ CONFIGURATION ============
@@ -33,6 +40,85 @@ SEARCH_CONFIG = {
 }
 
 
+# Generated design systems are cached on disk, keyed by query, parameters, the
+# data CSVs they are built from and how they are searched (core.INDEX_VERSION,
+# index specs, SEARCH_CONFIG). Bump CACHE_VERSION when generation or formatting
+# changes so older entries stop matching.
+CACHE_DIR = Path(os.environ.get("UIPRO_CACHE_DIR") or Path(__file__).parent.parent / "cache")
+CACHE_VERSION = 1
+CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+
+# ============ REASONING RULE INDEX ============
+class ReasoningIndex:
+    """
+    Precomputed lookups over reasoning rules, equivalent to the linear cascade:
+    exact UI_Category match, then substring match (either way), then any
+    UI_Category keyword occurring in the category. Earlier rules win each pass.
+    """
+
+    def __init__(self, rules: list):
+        self.rules = rules
+        self.names = [rule.get("UI_Category", "").lower() for rule in rules]
+        self.exact = {}  # UI_Category -> first rule position
+        self.keywords = {}  # UI_Category keyword -> first rule position
+        self.grams = defaultdict(set)  # trigram -> positions, for "category in UI_Category"
+        for pos, name in enumerate(self.names):
+            self.exact.setdefault(name, pos)
+            for kw in name.replace("/", " ").replace("-", " ").split():
+                self.keywords.setdefault(kw, pos)
+            for gram in self._grams(name):
+                self.grams[gram].add(pos)
+        self.max_len = max((len(key) for key in list(self.exact) + list(self.keywords)), default=0)
+        self._memo = {}
+
+    @staticmethod
+    def _grams(text: str) -> set:
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def _first(self, table: dict, substrings: set):
+        return min((table[sub] for sub in substrings if sub in table), default=None)
+
+    def _containing(self, category: str):
+        """First rule whose UI_Category contains category"""
+        if len(category) < 3:
+            candidates = range(len(self.names))
+        else:
+            candidates = set.intersection(*(self.grams.get(gram, set()) for gram in self._grams(category)))
+        return min((pos for pos in candidates if category in self.names[pos]), default=None)
+
+    def find(self, category: str) -> dict:
+        """Rule for a category (memoized), or {} if none matches."""
+        category_lower = category.lower()
+        if category_lower in self._memo:
+            return self._memo[category_lower]
+
+        pos = self.exact.get(category_lower)
+        if pos is None:
+            # Every substring of the category up to the longest UI_Category / keyword
+            substrings = {category_lower[i:j] for i in range(len(category_lower) + 1)
+                          for j in range(i, min(len(category_lower), i + self.max_len) + 1)}
+            partial = [p for p in (self._first(self.exact, substrings), self._containing(category_lower)) if p is not None]
+            pos = min(partial) if partial else self._first(self.keywords, substrings)
+
+        rule = self.rules[pos] if pos is not None else {}
+        self._memo[category_lower] = rule
+        return rule
+
+
+_reasoning_index = None  # (rules, ReasoningIndex) for the last loaded reasoning table
+_reasoning_index_lock = threading.Lock()
+
+
+def _get_reasoning_index(rules: list) -> ReasoningIndex:
+    """ReasoningIndex for a rules list, rebuilt only when the list itself changes."""
+    global _reasoning_index
+    with _reasoning_index_lock:
+        if _reasoning_index is None or _reasoning_index[0] is not rules:
+            _reasoning_index = (rules, ReasoningIndex(rules))
+        return _reasoning_index[1]
+
+
 # ============ DESIGN SYSTEM GENERATOR ============
 class DesignSystemGenerator:
     """Generates design system recommendations from aggregated searches."""
@@ -45,45 +131,25 @@ class DesignSystemGenerator:
         filepath = DATA_DIR / REASONING_FILE
         if not filepath.exists():
             return []
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return list(csv.DictReader(f))
+        return _load_csv(filepath)
 
-    def _multi_domain_search(self, query: str, style_priority: list = None) -> dict:
-        """Execute searches across multiple domains."""
+    def _multi_domain_search(self, query: str, style_priority: list = None, domains: list = None) -> dict:
+        """Execute searches across multiple domains; returns domain -> result."""
+        # Sequential on purpose: BM25 scoring holds the GIL and a search takes well
+        # under a millisecond, so a thread pool only adds overhead (benchmark.py
+        # design_system, 5000 rows: 1.2 ms sequential, 3.3-4.0 ms with 2-5 workers)
         results = {}
-        for domain, config in SEARCH_CONFIG.items():
+        for domain in domains or SEARCH_CONFIG:
+            domain_query = query
             if domain == "style" and style_priority:
                 # For style, also search with priority keywords
-                priority_query = " ".join(style_priority[:2]) if style_priority else query
-                combined_query = f"{query} {priority_query}"
-                results[domain] = search(combined_query, domain, config["max_results"])
-            else:
-                results[domain] = search(query, domain, config["max_results"])
+                domain_query = f"{query} {' '.join(style_priority[:2])}"
+            results[domain] = search(domain_query, domain, SEARCH_CONFIG[domain]["max_results"])
         return results
 
     def _find_reasoning_rule(self, category: str) -> dict:
-        """Find matching reasoning rule for a category."""
-        category_lower = category.lower()
-
-        # Try exact match first
-        for rule in self.reasoning_data:
-            if rule.get("UI_Category", "").lower() == category_lower:
-                return rule
-
-        # Try partial match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            if ui_cat in category_lower or category_lower in ui_cat:
-                return rule
-
-        # Try keyword match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            keywords = ui_cat.replace("/", " ").replace("-", " ").split()
-            if any(kw in category_lower for kw in keywords):
-                return rule
-
-        return {}
+        """Find matching reasoning rule for a category (exact, then partial, then keyword match)."""
+        return _get_reasoning_index(self.reasoning_data).find(category)
 
     def _apply_reasoning(self, category: str, search_results: dict) -> dict:
         """Apply reasoning rules to search results."""
@@ -127,7 +193,8 @@ class DesignSystemGenerator:
         if not priority_keywords:
             return results[0]
 
-        # First: try exact style name match
+        # Exact style name match wins; otherwise trust the BM25F ranking, which
+        # already weights "Style Category" and "Keywords" above other fields
         for priority in priority_keywords:
             priority_lower = priority.lower().strip()
             for result in results:
@@ -135,26 +202,7 @@ class DesignSystemGenerator:
                 if priority_lower in style_name or style_name in priority_lower:
                     return result
 
-        # Second: score by keyword match in all fields
-        scored = []
-        for result in results:
-            result_str = str(result).lower()
-            score = 0
-            for kw in priority_keywords:
-                kw_lower = kw.lower().strip()
-                # Higher score for style name match
-                if kw_lower in result.get("Style Category", "").lower():
-                    score += 10
-                # Lower score for keyword field match
-                elif kw_lower in result.get("Keywords", "").lower():
-                    score += 3
-                # Even lower for other field matches
-                elif kw_lower in result_str:
-                    score += 1
-            scored.append((score, result))
-
-        scored.sort(key=lambda x: x[0], reverse=True)
-        return scored[0][1] if scored and scored[0][0] > 0 else results[0]
+        return results[0]
 
     def _extract_results(self, search_result: dict) -> list:
         """Extract results list from search result dict."""
@@ -162,8 +210,10 @@ class DesignSystemGenerator:
 
     def generate(self, query: str, project_name: str = None) -> dict:
         """Generate complete design system recommendation."""
-        # Step 1: First search product to get category
-        product_result = search(query, "product", 1)
+        # Step 1: Search product (for the category) and every domain that does not
+        # depend on it; only style waits for the reasoning rules
+        results = self._multi_domain_search(query, domains=[d for d in SEARCH_CONFIG if d != "style"])
+        product_result = results["product"]
         product_results = product_result.get("results", [])
         category = "General"
         if product_results:
@@ -173,9 +223,9 @@ class DesignSystemGenerator:
         reasoning = self._apply_reasoning(category, {})
         style_priority = reasoning.get("style_priority", [])
 
-        # Step 3: Multi-domain search with style priority hints
-        search_results = self._multi_domain_search(query, style_priority)
-        search_results["product"] = product_result  # Reuse product search
+        # Step 3: Style search with priority hints; merge in SEARCH_CONFIG order
+        results.update(self._multi_domain_search(query, style_priority, domains=["style"]))
+        search_results = {domain: results[domain] for domain in SEARCH_CONFIG}
 
         # Step 4: Select best matches from each domain using priority
         style_results = self._extract_results(search_results.get("style", {}))
@@ -458,9 +508,142 @@ def format_markdown(design_system: dict) -> str:
     return "\n".join(lines)
 
 
+# ============ RESULT CACHE ============
+class ResultCache:
+    """
+    Content-addressed on-disk store of generated design systems.
+
+    Each entry is <sha256 of its key>.json holding the design system dict and
+    its rendered output. File mtimes record recency: hits touch the entry and
+    the least recently used entries are evicted above max_bytes. Hit/miss
+    counters are kept in memory, for this instance only.
+    """
+
+    def __init__(self, directory: Path = None, max_bytes: int = CACHE_MAX_BYTES):
+        self.directory = Path(directory or CACHE_DIR)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _fingerprint() -> list:
+        """(file, mtime_ns, size) of every CSV a design system is built from."""
+        files = [CSV_CONFIG[domain]["file"] for domain in SEARCH_CONFIG] + [REASONING_FILE]
+        fingerprint = []
+        for file in files:
+            try:
+                stat = (DATA_DIR / file).stat()
+                fingerprint.append([file, stat.st_mtime_ns, stat.st_size])
+            except OSError:
+                fingerprint.append([file, None, None])
+        return fingerprint
+
+    @staticmethod
+    def _search_spec() -> str:
+        """Hash of how the domains are indexed and searched: a change re-ranks results."""
+        spec = {
+            "index_version": INDEX_VERSION,
+            "indexes": {domain: _index_spec(CSV_CONFIG[domain]) for domain in SEARCH_CONFIG},
+            "search": SEARCH_CONFIG
+        }
+        return hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def key(self, query: str, project_name: str, output_format: str) -> str:
+        """Cache key: the query is normalized (case, whitespace) as search ignores both."""
+        fields = {
+            "version": CACHE_VERSION,
+            "query": " ".join(query.lower().split()),
+            # The default project name is the raw query, upper-cased
+            "project_name": project_name or query.upper(),
+            "format": output_format,
+            "data": self._fingerprint(),
+            "search": self._search_spec()
+        }
+        return hashlib.sha256(json.dumps(fields, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _entries(self) -> list:
+        try:
+            return list(self.directory.glob("*.json"))
+        except OSError:
+            return []
+
+    def _write_json(self, path: Path, payload: dict):
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def get(self, key: str):
+        """Cached entry for key (marking it recently used), or None."""
+        path = self.directory / f"{key}.json"
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: dict):
+        """Store an entry, then evict least recently used entries over max_bytes."""
+        self._write_json(self.directory / f"{key}.json", entry)
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+            except OSError:
+                continue
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        """Entry count and size on disk, plus this instance's hit/miss counters."""
+        sizes = []
+        for path in self._entries():
+            try:
+                sizes.append(path.stat().st_size)
+            except OSError:
+                continue
+        return {
+            "directory": str(self.directory),
+            "entries": len(sizes),
+            "bytes": sum(sizes),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+# Shared by every call in this process, so its counters cover all of them
+_default_cache = ResultCache()
+
+
+def cache_stats() -> dict:
+    """Statistics of the default design-system result cache, counted since this process started."""
+    return _default_cache.stats()
+
+
 # ============ MAIN ENTRY POINT ============
 def generate_design_system(query: str, project_name: str = None, output_format: str = "ascii", 
-                           persist: bool = False, page: str = None, output_dir: str = None) -> str:
+                           persist: bool = False, page: str = None, output_dir: str = None,
+                           pages: list = None, use_cache: bool = True) -> str:
     """
     Main entry point for design system generation.
 
@@ -471,24 +654,40 @@ def generate_design_system(query: str, project_name: str = None, output_format:
         persist: If True, save design system to design-system/ folder
         page: Optional page name for page-specific override file
         output_dir: Optional output directory (defaults to current working directory)
+        pages: Optional list of page names; one override file each (page batch mode)
+        use_cache: If False, skip the on-disk result cache
 
     Returns:
         Formatted design system string
     """
-    generator = DesignSystemGenerator()
-    design_system = generator.generate(query, project_name)
+    cache = _default_cache if use_cache else None
+    key = cache.key(query, project_name, output_format) if cache else None
+    entry = cache.get(key) if cache else None
+
+    if entry:
+        design_system = entry["design_system"]
+    else:
+        generator = DesignSystemGenerator()
+        design_system = generator.generate(query, project_name)
     
     # Persist to files if requested
     if persist:
-        persist_design_system(design_system, page, output_dir, query)
+        persist_design_system(design_system, page, output_dir, query, pages)
 
+    if entry:
+        return entry["output"]
     if output_format == "markdown":
-        return format_markdown(design_system)
-    return format_ascii_box(design_system)
+        output = format_markdown(design_system)
+    else:
+        output = format_ascii_box(design_system)
+    if cache:
+        cache.put(key, {"design_system": design_system, "output": output})
+    return output
 
 
 # ============ PERSISTENCE FUNCTIONS ============
-def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None) -> dict:
+def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None,
+                          pages: list = None) -> dict:
     """
     Persist design system to design-system/<project>/ folder using Master + Overrides pattern.
     
@@ -497,6 +696,11 @@ def persist_design_system(design_system: dict, page: str = None, output_dir: str
         page: Optional page name for page-specific override file
         output_dir: Optional output directory (defaults to current working directory)
         page_query: Optional query string for intelligent page override generation
+        pages: Optional list of page names; their overrides are written in order,
+               after MASTER.md (written once)
+    
+    Files are written atomically; a file whose content only differs in its
+    Generated timestamp is not rewritten (listed in "unchanged_files").
     
     Returns:
         dict with created file paths and status
@@ -519,28 +723,77 @@ def persist_design_system(design_system: dict, page: str = None, output_dir: str
     master_file = design_system_dir / "MASTER.md"
     
     # Generate and write MASTER.md
-    master_content = format_master_md(design_system)
-    with open(master_file, 'w', encoding='utf-8') as f:
-        f.write(master_content)
+    unchanged_files = []
+    if not write_lines(master_file, _master_md_lines(design_system)):
+        unchanged_files.append(str(master_file))
     created_files.append(str(master_file))
     
-    # If page is specified, create page override file with intelligent content
-    if page:
-        page_file = pages_dir / f"{page.lower().replace(' ', '-')}.md"
-        page_content = format_page_override_md(design_system, page, page_query)
-        with open(page_file, 'w', encoding='utf-8') as f:
-            f.write(page_content)
+    # If pages are specified, create page override files with intelligent content
+    page_files = {}
+    for name in ([page] if page else []) + list(pages or []):
+        page_files.setdefault(pages_dir / f"{name.lower().replace(' ', '-')}.md", name)
+    for page_file, name in page_files.items():
+        if not write_lines(page_file, _page_override_md_lines(design_system, name, page_query)):
+            unchanged_files.append(str(page_file))
         created_files.append(str(page_file))
     
     return {
         "status": "success",
         "design_system_dir": str(design_system_dir),
-        "created_files": created_files
+        "created_files": created_files,
+        "unchanged_files": unchanged_files
     }
 
 
+def _stable_line(line: str) -> str:
+    """Line as compared for change detection: the Generated timestamp is ignored."""
+    if line.startswith(("**Generated:**", "> **Generated:**")):
+        return line.split("**Generated:**")[0] + "**Generated:**"
+    return line
+
+
+def _lines_digest(lines) -> str:
+    digest = hashlib.sha256()
+    for line in lines:
+        digest.update(_stable_line(line).encode("utf-8") + b"\n")
+    return digest.hexdigest()
+
+
+def write_lines(path: Path, lines) -> bool:
+    """
+    Stream lines (joined by newlines) into path through a temp file and rename.
+
+    If the existing file has the same content apart from its Generated
+    timestamp, it is left untouched and False is returned.
+    """
+    digest = hashlib.sha256()
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for i, line in enumerate(lines):
+                f.write(line if i == 0 else "\n" + line)
+                digest.update(_stable_line(line).encode("utf-8") + b"\n")
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                unchanged = _lines_digest(f.read().split("\n")) == digest.hexdigest()
+        except (OSError, UnicodeDecodeError):
+            unchanged = False
+        if unchanged:
+            return False
+        os.replace(tmp, path)
+        return True
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
 def format_master_md(design_system: dict) -> str:
     """Format design system as MASTER.md with hierarchical override logic."""
+    return "\n".join(_master_md_lines(design_system))
+
+
+def _master_md_lines(design_system: dict):
+    """Yield the lines of MASTER.md."""
     project = design_system.get("project_name", "PROJECT")
     pattern = design_system.get("pattern", {})
     style = design_system.get("style", {})
@@ -551,259 +804,260 @@ def format_master_md(design_system: dict) -> str:
     
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
-    lines = []
-    
     # Logic header
-    lines.append("# Design System Master File")
-    lines.append("")
-    lines.append("> **LOGIC:** When building a specific page, first check `design-system/pages/[page-name].md`.")
-    lines.append("> If that file exists, its rules **override** this Master file.")
-    lines.append("> If not, strictly follow the rules below.")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-    lines.append(f"**Project:** {project}")
-    lines.append(f"**Generated:** {timestamp}")
-    lines.append(f"**Category:** {design_system.get('category', 'General')}")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
+    yield "# Design System Master File"
+    yield ""
+    yield "> **LOGIC:** When building a specific page, first check `design-system/pages/[page-name].md`."
+    yield "> If that file exists, its rules **override** this Master file."
+    yield "> If not, strictly follow the rules below."
+    yield ""
+    yield "---"
+    yield ""
+    yield f"**Project:** {project}"
+    yield f"**Generated:** {timestamp}"
+    yield f"**Category:** {design_system.get('category', 'General')}"
+    yield ""
+    yield "---"
+    yield ""
     
     # Global Rules section
-    lines.append("## Global Rules")
-    lines.append("")
+    yield "## Global Rules"
+    yield ""
     
     # Color Palette
-    lines.append("### Color Palette")
-    lines.append("")
-    lines.append("| Role | Hex | CSS Variable |")
-    lines.append("|------|-----|--------------|")
-    lines.append(f"| Primary | `{colors.get('primary', '#2563EB')}` | `--color-primary` |")
-    lines.append(f"| Secondary | `{colors.get('secondary', '#3B82F6')}` | `--color-secondary` |")
-    lines.append(f"| CTA/Accent | `{colors.get('cta', '#F97316')}` | `--color-cta` |")
-    lines.append(f"| Background | `{colors.get('background', '#F8FAFC')}` | `--color-background` |")
-    lines.append(f"| Text | `{colors.get('text', '#1E293B')}` | `--color-text` |")
-    lines.append("")
+    yield "### Color Palette"
+    yield ""
+    yield "| Role | Hex | CSS Variable |"
+    yield "|------|-----|--------------|"
+    yield f"| Primary | `{colors.get('primary', '#2563EB')}` | `--color-primary` |"
+    yield f"| Secondary | `{colors.get('secondary', '#3B82F6')}` | `--color-secondary` |"
+    yield f"| CTA/Accent | `{colors.get('cta', '#F97316')}` | `--color-cta` |"
+    yield f"| Background | `{colors.get('background', '#F8FAFC')}` | `--color-background` |"
+    yield f"| Text | `{colors.get('text', '#1E293B')}` | `--color-text` |"
+    yield ""
     if colors.get("notes"):
-        lines.append(f"**Color Notes:** {colors.get('notes', '')}")
-        lines.append("")
+        yield f"**Color Notes:** {colors.get('notes', '')}"
+        yield ""
     
     # Typography
-    lines.append("### Typography")
-    lines.append("")
-    lines.append(f"- **Heading Font:** {typography.get('heading', 'Inter')}")
-    lines.append(f"- **Body Font:** {typography.get('body', 'Inter')}")
+    yield "### Typography"
+    yield ""
+    yield f"- **Heading Font:** {typography.get('heading', 'Inter')}"
+    yield f"- **Body Font:** {typography.get('body', 'Inter')}"
     if typography.get("mood"):
-        lines.append(f"- **Mood:** {typography.get('mood', '')}")
+        yield f"- **Mood:** {typography.get('mood', '')}"
     if typography.get("google_fonts_url"):
-        lines.append(f"- **Google Fonts:** [{typography.get('heading', '')} + {typography.get('body', '')}]({typography.get('google_fonts_url', '')})")
-    lines.append("")
+        yield f"- **Google Fonts:** [{typography.get('heading', '')} + {typography.get('body', '')}]({typography.get('google_fonts_url', '')})"
+    yield ""
     if typography.get("css_import"):
-        lines.append("**CSS Import:**")
-        lines.append("```css")
-        lines.append(typography.get("css_import", ""))
-        lines.append("```")
-        lines.append("")
+        yield "**CSS Import:**"
+        yield "```css"
+        yield typography.get("css_import", "")
+        yield "```"
+        yield ""
     
     # Spacing Variables
-    lines.append("### Spacing Variables")
-    lines.append("")
-    lines.append("| Token | Value | Usage |")
-    lines.append("|-------|-------|-------|")
-    lines.append("| `--space-xs` | `4px` / `0.25rem` | Tight gaps |")
-    lines.append("| `--space-sm` | `8px` / `0.5rem` | Icon gaps, inline spacing |")
-    lines.append("| `--space-md` | `16px` / `1rem` | Standard padding |")
-    lines.append("| `--space-lg` | `24px` / `1.5rem` | Section padding |")
-    lines.append("| `--space-xl` | `32px` / `2rem` | Large gaps |")
-    lines.append("| `--space-2xl` | `48px` / `3rem` | Section margins |")
-    lines.append("| `--space-3xl` | `64px` / `4rem` | Hero padding |")
-    lines.append("")
+    yield "### Spacing Variables"
+    yield ""
+    yield "| Token | Value | Usage |"
+    yield "|-------|-------|-------|"
+    yield "| `--space-xs` | `4px` / `0.25rem` | Tight gaps |"
+    yield "| `--space-sm` | `8px` / `0.5rem` | Icon gaps, inline spacing |"
+    yield "| `--space-md` | `16px` / `1rem` | Standard padding |"
+    yield "| `--space-lg` | `24px` / `1.5rem` | Section padding |"
+    yield "| `--space-xl` | `32px` / `2rem` | Large gaps |"
+    yield "| `--space-2xl` | `48px` / `3rem` | Section margins |"
+    yield "| `--space-3xl` | `64px` / `4rem` | Hero padding |"
+    yield ""
     
     # Shadow Depths
-    lines.append("### Shadow Depths")
-    lines.append("")
-    lines.append("| Level | Value | Usage |")
-    lines.append("|-------|-------|-------|")
-    lines.append("| `--shadow-sm` | `0 1px 2px rgba(0,0,0,0.05)` | Subtle lift |")
-    lines.append("| `--shadow-md` | `0 4px 6px rgba(0,0,0,0.1)` | Cards, buttons |")
-    lines.append("| `--shadow-lg` | `0 10px 15px rgba(0,0,0,0.1)` | Modals, dropdowns |")
-    lines.append("| `--shadow-xl` | `0 20px 25px rgba(0,0,0,0.15)` | Hero images, featured cards |")
-    lines.append("")
+    yield "### Shadow Depths"
+    yield ""
+    yield "| Level | Value | Usage |"
+    yield "|-------|-------|-------|"
+    yield "| `--shadow-sm` | `0 1px 2px rgba(0,0,0,0.05)` | Subtle lift |"
+    yield "| `--shadow-md` | `0 4px 6px rgba(0,0,0,0.1)` | Cards, buttons |"
+    yield "| `--shadow-lg` | `0 10px 15px rgba(0,0,0,0.1)` | Modals, dropdowns |"
+    yield "| `--shadow-xl` | `0 20px 25px rgba(0,0,0,0.15)` | Hero images, featured cards |"
+    yield ""
     
     # Component Specs section
-    lines.append("---")
-    lines.append("")
-    lines.append("## Component Specs")
-    lines.append("")
+    yield "---"
+    yield ""
+    yield "## Component Specs"
+    yield ""
     
     # Buttons
-    lines.append("### Buttons")
-    lines.append("")
-    lines.append("```css")
-    lines.append("/* Primary Button */")
-    lines.append(".btn-primary {")
-    lines.append(f"  background: {colors.get('cta', '#F97316')};")
-    lines.append("  color: white;")
-    lines.append("  padding: 12px 24px;")
-    lines.append("  border-radius: 8px;")
-    lines.append("  font-weight: 600;")
-    lines.append("  transition: all 200ms ease;")
-    lines.append("  cursor: pointer;")
-    lines.append("}")
-    lines.append("")
-    lines.append(".btn-primary:hover {")
-    lines.append("  opacity: 0.9;")
-    lines.append("  transform: translateY(-1px);")
-    lines.append("}")
-    lines.append("")
-    lines.append("/* Secondary Button */")
-    lines.append(".btn-secondary {")
-    lines.append(f"  background: transparent;")
-    lines.append(f"  color: {colors.get('primary', '#2563EB')};")
-    lines.append(f"  border: 2px solid {colors.get('primary', '#2563EB')};")
-    lines.append("  padding: 12px 24px;")
-    lines.append("  border-radius: 8px;")
-    lines.append("  font-weight: 600;")
-    lines.append("  transition: all 200ms ease;")
-    lines.append("  cursor: pointer;")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
+    yield "### Buttons"
+    yield ""
+    yield "```css"
+    yield "/* Primary Button */"
+    yield ".btn-primary {"
+    yield f"  background: {colors.get('cta', '#F97316')};"
+    yield "  color: white;"
+    yield "  padding: 12px 24px;"
+    yield "  border-radius: 8px;"
+    yield "  font-weight: 600;"
+    yield "  transition: all 200ms ease;"
+    yield "  cursor: pointer;"
+    yield "}"
+    yield ""
+    yield ".btn-primary:hover {"
+    yield "  opacity: 0.9;"
+    yield "  transform: translateY(-1px);"
+    yield "}"
+    yield ""
+    yield "/* Secondary Button */"
+    yield ".btn-secondary {"
+    yield f"  background: transparent;"
+    yield f"  color: {colors.get('primary', '#2563EB')};"
+    yield f"  border: 2px solid {colors.get('primary', '#2563EB')};"
+    yield "  padding: 12px 24px;"
+    yield "  border-radius: 8px;"
+    yield "  font-weight: 600;"
+    yield "  transition: all 200ms ease;"
+    yield "  cursor: pointer;"
+    yield "}"
+    yield "```"
+    yield ""
     
     # Cards
-    lines.append("### Cards")
-    lines.append("")
-    lines.append("```css")
-    lines.append(".card {")
-    lines.append(f"  background: {colors.get('background', '#FFFFFF')};")
-    lines.append("  border-radius: 12px;")
-    lines.append("  padding: 24px;")
-    lines.append("  box-shadow: var(--shadow-md);")
-    lines.append("  transition: all 200ms ease;")
-    lines.append("  cursor: pointer;")
-    lines.append("}")
-    lines.append("")
-    lines.append(".card:hover {")
-    lines.append("  box-shadow: var(--shadow-lg);")
-    lines.append("  transform: translateY(-2px);")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
+    yield "### Cards"
+    yield ""
+    yield "```css"
+    yield ".card {"
+    yield f"  background: {colors.get('background', '#FFFFFF')};"
+    yield "  border-radius: 12px;"
+    yield "  padding: 24px;"
+    yield "  box-shadow: var(--shadow-md);"
+    yield "  transition: all 200ms ease;"
+    yield "  cursor: pointer;"
+    yield "}"
+    yield ""
+    yield ".card:hover {"
+    yield "  box-shadow: var(--shadow-lg);"
+    yield "  transform: translateY(-2px);"
+    yield "}"
+    yield "```"
+    yield ""
     
     # Inputs
-    lines.append("### Inputs")
-    lines.append("")
-    lines.append("```css")
-    lines.append(".input {")
-    lines.append("  padding: 12px 16px;")
-    lines.append("  border: 1px solid #E2E8F0;")
-    lines.append("  border-radius: 8px;")
-    lines.append("  font-size: 16px;")
-    lines.append("  transition: border-color 200ms ease;")
-    lines.append("}")
-    lines.append("")
-    lines.append(".input:focus {")
-    lines.append(f"  border-color: {colors.get('primary', '#2563EB')};")
-    lines.append("  outline: none;")
-    lines.append(f"  box-shadow: 0 0 0 3px {colors.get('primary', '#2563EB')}20;")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
+    yield "### Inputs"
+    yield ""
+    yield "```css"
+    yield ".input {"
+    yield "  padding: 12px 16px;"
+    yield "  border: 1px solid #E2E8F0;"
+    yield "  border-radius: 8px;"
+    yield "  font-size: 16px;"
+    yield "  transition: border-color 200ms ease;"
+    yield "}"
+    yield ""
+    yield ".input:focus {"
+    yield f"  border-color: {colors.get('primary', '#2563EB')};"
+    yield "  outline: none;"
+    yield f"  box-shadow: 0 0 0 3px {colors.get('primary', '#2563EB')}20;"
+    yield "}"
+    yield "```"
+    yield ""
     
     # Modals
-    lines.append("### Modals")
-    lines.append("")
-    lines.append("```css")
-    lines.append(".modal-overlay {")
-    lines.append("  background: rgba(0, 0, 0, 0.5);")
-    lines.append("  backdrop-filter: blur(4px);")
-    lines.append("}")
-    lines.append("")
-    lines.append(".modal {")
-    lines.append("  background: white;")
-    lines.append("  border-radius: 16px;")
-    lines.append("  padding: 32px;")
-    lines.append("  box-shadow: var(--shadow-xl);")
-    lines.append("  max-width: 500px;")
-    lines.append("  width: 90%;")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
+    yield "### Modals"
+    yield ""
+    yield "```css"
+    yield ".modal-overlay {"
+    yield "  background: rgba(0, 0, 0, 0.5);"
+    yield "  backdrop-filter: blur(4px);"
+    yield "}"
+    yield ""
+    yield ".modal {"
+    yield "  background: white;"
+    yield "  border-radius: 16px;"
+    yield "  padding: 32px;"
+    yield "  box-shadow: var(--shadow-xl);"
+    yield "  max-width: 500px;"
+    yield "  width: 90%;"
+    yield "}"
+    yield "```"
+    yield ""
     
     # Style section
-    lines.append("---")
-    lines.append("")
-    lines.append("## Style Guidelines")
-    lines.append("")
-    lines.append(f"**Style:** {style.get('name', 'Minimalism')}")
-    lines.append("")
+    yield "---"
+    yield ""
+    yield "## Style Guidelines"
+    yield ""
+    yield f"**Style:** {style.get('name', 'Minimalism')}"
+    yield ""
     if style.get("keywords"):
-        lines.append(f"**Keywords:** {style.get('keywords', '')}")
-        lines.append("")
+        yield f"**Keywords:** {style.get('keywords', '')}"
+        yield ""
     if style.get("best_for"):
-        lines.append(f"**Best For:** {style.get('best_for', '')}")
-        lines.append("")
+        yield f"**Best For:** {style.get('best_for', '')}"
+        yield ""
     if effects:
-        lines.append(f"**Key Effects:** {effects}")
-        lines.append("")
+        yield f"**Key Effects:** {effects}"
+        yield ""
     
     # Layout Pattern
-    lines.append("### Page Pattern")
-    lines.append("")
-    lines.append(f"**Pattern Name:** {pattern.get('name', '')}")
-    lines.append("")
+    yield "### Page Pattern"
+    yield ""
+    yield f"**Pattern Name:** {pattern.get('name', '')}"
+    yield ""
     if pattern.get('conversion'):
-        lines.append(f"- **Conversion Strategy:** {pattern.get('conversion', '')}")
+        yield f"- **Conversion Strategy:** {pattern.get('conversion', '')}"
     if pattern.get('cta_placement'):
-        lines.append(f"- **CTA Placement:** {pattern.get('cta_placement', '')}")
-    lines.append(f"- **Section Order:** {pattern.get('sections', '')}")
-    lines.append("")
+        yield f"- **CTA Placement:** {pattern.get('cta_placement', '')}"
+    yield f"- **Section Order:** {pattern.get('sections', '')}"
+    yield ""
     
     # Anti-Patterns section
-    lines.append("---")
-    lines.append("")
-    lines.append("## Anti-Patterns (Do NOT Use)")
-    lines.append("")
+    yield "---"
+    yield ""
+    yield "## Anti-Patterns (Do NOT Use)"
+    yield ""
     if anti_patterns:
         anti_list = [a.strip() for a in anti_patterns.split("+")]
         for anti in anti_list:
             if anti:
-                lines.append(f"- ❌ {anti}")
-    lines.append("")
-    lines.append("### Additional Forbidden Patterns")
-    lines.append("")
-    lines.append("- ❌ **Emojis as icons** — Use SVG icons (Heroicons, Lucide, Simple Icons)")
-    lines.append("- ❌ **Missing cursor:pointer** — All clickable elements must have cursor:pointer")
-    lines.append("- ❌ **Layout-shifting hovers** — Avoid scale transforms that shift layout")
-    lines.append("- ❌ **Low contrast text** — Maintain 4.5:1 minimum contrast ratio")
-    lines.append("- ❌ **Instant state changes** — Always use transitions (150-300ms)")
-    lines.append("- ❌ **Invisible focus states** — Focus states must be visible for a11y")
-    lines.append("")
+                yield f"- ❌ {anti}"
+    yield ""
+    yield "### Additional Forbidden Patterns"
+    yield ""
+    yield "- ❌ **Emojis as icons** — Use SVG icons (Heroicons, Lucide, Simple Icons)"
+    yield "- ❌ **Missing cursor:pointer** — All clickable elements must have cursor:pointer"
+    yield "- ❌ **Layout-shifting hovers** — Avoid scale transforms that shift layout"
+    yield "- ❌ **Low contrast text** — Maintain 4.5:1 minimum contrast ratio"
+    yield "- ❌ **Instant state changes** — Always use transitions (150-300ms)"
+    yield "- ❌ **Invisible focus states** — Focus states must be visible for a11y"
+    yield ""
     
     # Pre-Delivery Checklist
-    lines.append("---")
-    lines.append("")
-    lines.append("## Pre-Delivery Checklist")
-    lines.append("")
-    lines.append("Before delivering any UI code, verify:")
-    lines.append("")
-    lines.append("- [ ] No emojis used as icons (use SVG instead)")
-    lines.append("- [ ] All icons from consistent icon set (Heroicons/Lucide)")
-    lines.append("- [ ] `cursor-pointer` on all clickable elements")
-    lines.append("- [ ] Hover states with smooth transitions (150-300ms)")
-    lines.append("- [ ] Light mode: text contrast 4.5:1 minimum")
-    lines.append("- [ ] Focus states visible for keyboard navigation")
-    lines.append("- [ ] `prefers-reduced-motion` respected")
-    lines.append("- [ ] Responsive: 375px, 768px, 1024px, 1440px")
-    lines.append("- [ ] No content hidden behind fixed navbars")
-    lines.append("- [ ] No horizontal scroll on mobile")
-    lines.append("")
-    
-    return "\n".join(lines)
+    yield "---"
+    yield ""
+    yield "## Pre-Delivery Checklist"
+    yield ""
+    yield "Before delivering any UI code, verify:"
+    yield ""
+    yield "- [ ] No emojis used as icons (use SVG instead)"
+    yield "- [ ] All icons from consistent icon set (Heroicons/Lucide)"
+    yield "- [ ] `cursor-pointer` on all clickable elements"
+    yield "- [ ] Hover states with smooth transitions (150-300ms)"
+    yield "- [ ] Light mode: text contrast 4.5:1 minimum"
+    yield "- [ ] Focus states visible for keyboard navigation"
+    yield "- [ ] `prefers-reduced-motion` respected"
+    yield "- [ ] Responsive: 375px, 768px, 1024px, 1440px"
+    yield "- [ ] No content hidden behind fixed navbars"
+    yield "- [ ] No horizontal scroll on mobile"
+    yield ""
 
 
 def format_page_override_md(design_system: dict, page_name: str, page_query: str = None) -> str:
     """Format a page-specific override file with intelligent AI-generated content."""
+    return "\n".join(_page_override_md_lines(design_system, page_name, page_query))
+
+
+def _page_override_md_lines(design_system: dict, page_name: str, page_query: str = None):
+    """Yield the lines of a page override file."""
     project = design_system.get("project_name", "PROJECT")
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     page_title = page_name.replace("-", " ").replace("_", " ").title()
@@ -811,104 +1065,100 @@ def format_page_override_md(design_system: dict, page_name: str, page_query: str
     # Detect page type and generate intelligent overrides
     page_overrides = _generate_intelligent_overrides(page_name, page_query, design_system)
     
-    lines = []
-    
-    lines.append(f"# {page_title} Page Overrides")
-    lines.append("")
-    lines.append(f"> **PROJECT:** {project}")
-    lines.append(f"> **Generated:** {timestamp}")
-    lines.append(f"> **Page Type:** {page_overrides.get('page_type', 'General')}")
-    lines.append("")
-    lines.append("> ⚠️ **IMPORTANT:** Rules in this file **override** the Master file (`design-system/MASTER.md`).")
-    lines.append("> Only deviations from the Master are documented here. For all other rules, refer to the Master.")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
+    yield f"# {page_title} Page Overrides"
+    yield ""
+    yield f"> **PROJECT:** {project}"
+    yield f"> **Generated:** {timestamp}"
+    yield f"> **Page Type:** {page_overrides.get('page_type', 'General')}"
+    yield ""
+    yield "> ⚠️ **IMPORTANT:** Rules in this file **override** the Master file (`design-system/MASTER.md`)."
+    yield "> Only deviations from the Master are documented here. For all other rules, refer to the Master."
+    yield ""
+    yield "---"
+    yield ""
     
     # Page-specific rules with actual content
-    lines.append("## Page-Specific Rules")
-    lines.append("")
+    yield "## Page-Specific Rules"
+    yield ""
     
     # Layout Overrides
-    lines.append("### Layout Overrides")
-    lines.append("")
+    yield "### Layout Overrides"
+    yield ""
     layout = page_overrides.get("layout", {})
     if layout:
         for key, value in layout.items():
-            lines.append(f"- **{key}:** {value}")
+            yield f"- **{key}:** {value}"
     else:
-        lines.append("- No overrides — use Master layout")
-    lines.append("")
+        yield "- No overrides — use Master layout"
+    yield ""
     
     # Spacing Overrides
-    lines.append("### Spacing Overrides")
-    lines.append("")
+    yield "### Spacing Overrides"
+    yield ""
     spacing = page_overrides.get("spacing", {})
     if spacing:
         for key, value in spacing.items():
-            lines.append(f"- **{key}:** {value}")
+            yield f"- **{key}:** {value}"
     else:
-        lines.append("- No overrides — use Master spacing")
-    lines.append("")
+        yield "- No overrides — use Master spacing"
+    yield ""
     
     # Typography Overrides
-    lines.append("### Typography Overrides")
-    lines.append("")
+    yield "### Typography Overrides"
+    yield ""
     typography = page_overrides.get("typography", {})
     if typography:
         for key, value in typography.items():
-            lines.append(f"- **{key}:** {value}")
+            yield f"- **{key}:** {value}"
     else:
-        lines.append("- No overrides — use Master typography")
-    lines.append("")
+        yield "- No overrides — use Master typography"
+    yield ""
     
     # Color Overrides
-    lines.append("### Color Overrides")
-    lines.append("")
+    yield "### Color Overrides"
+    yield ""
     colors = page_overrides.get("colors", {})
     if colors:
         for key, value in colors.items():
-            lines.append(f"- **{key}:** {value}")
+            yield f"- **{key}:** {value}"
     else:
-        lines.append("- No overrides — use Master colors")
-    lines.append("")
+        yield "- No overrides — use Master colors"
+    yield ""
     
     # Component Overrides
-    lines.append("### Component Overrides")
-    lines.append("")
+    yield "### Component Overrides"
+    yield ""
     components = page_overrides.get("components", [])
     if components:
         for comp in components:
-            lines.append(f"- {comp}")
+            yield f"- {comp}"
     else:
-        lines.append("- No overrides — use Master component specs")
-    lines.append("")
+        yield "- No overrides — use Master component specs"
+    yield ""
     
     # Page-Specific Components
-    lines.append("---")
-    lines.append("")
-    lines.append("## Page-Specific Components")
-    lines.append("")
+    yield "---"
+    yield ""
+    yield "## Page-Specific Components"
+    yield ""
     unique_components = page_overrides.get("unique_components", [])
     if unique_components:
         for comp in unique_components:
-            lines.append(f"- {comp}")
+            yield f"- {comp}"
     else:
-        lines.append("- No unique components for this page")
-    lines.append("")
+        yield "- No unique components for this page"
+    yield ""
     
     # Recommendations
-    lines.append("---")
-    lines.append("")
-    lines.append("## Recommendations")
-    lines.append("")
+    yield "---"
+    yield ""
+    yield "## Recommendations"
+    yield ""
     recommendations = page_overrides.get("recommendations", [])
     if recommendations:
         for rec in recommendations:
-            lines.append(f"- {rec}")
-    lines.append("")
-    
-    return "\n".join(lines)
+            yield f"- {rec}"
+    yield ""
 
 
 def _generate_intelligent_overrides(page_name: str, page_query: str, design_system: dict) -> dict:
@@ -918,16 +1168,16 @@ def _generate_intelligent_overrides(page_name: str, page_query: str, design_syst
     Uses the existing search infrastructure to find relevant style, UX, and layout
     data instead of hardcoded page types.
     """
-    from core import search
-    
     page_lower = page_name.lower()
     query_lower = (page_query or "").lower()
     combined_context = f"{page_lower} {query_lower}"
     
     # Search across multiple domains for page-specific guidance
-    style_search = search(combined_context, "style", max_results=1)
-    ux_search = search(combined_context, "ux", max_results=3)
-    landing_search = search(combined_context, "landing", max_results=1)
+    style_search, ux_search, landing_search = search_many([
+        (combined_context, "style", 1),
+        (combined_context, "ux", 3),
+        (combined_context, "landing", 1)
+    ])
     
     # Extract results from search response
     style_results = style_search.get("results", [])
@@ -3,20 +3,53 @@
 """
 UI/UX Pro Max Search - BM25 search engine for UI/UX style guides
 Usage: python search.py "<query>" [--domain <domain>] [--stack <stack>] [--max-results 3]
+       python search.py "<query>" --top-domains 3
+       python search.py "<query>" --all [ux,web,stack:react]
        python search.py "<query>" --design-system [-p "Project Name"]
        python search.py "<query>" --design-system --persist [-p "Project Name"] [--page "dashboard"]
+       python search.py "<query>" --design-system --persist --page dashboard --page settings --page checkout
 
 Domains: style, prompt, color, chart, landing, product, ux, typography
 Stacks: html-tailwind, react, nextjs
 
+Global search:
+  --all        Search every domain and stack through one index and merge the
+               hits; optionally limit it to a comma-separated list of sources
+
 Persistence (Master + Overrides pattern):
   --persist    Save design system to design-system/MASTER.md
-  --page       Also create a page-specific override file in design-system/pages/
+  --page       Also create a page-specific override file in design-system/pages/;
+               repeat it to generate many pages from one design system in one run
+
+Design system cache (see design_system.ResultCache):
+  --no-cache      Regenerate instead of reusing a cached design system
+  --cache-stats   Print entries and size of the cache, plus the hit/miss counts
+                  of the running daemon (or of this process when none runs)
+
+Startup cost:
+  --profile-startup   Re-run the command under `python -X importtime` and
+                      report wall time plus import time per module
+
+Search daemon (see daemon.py):
+  --serve      Keep all indexes warm behind a Unix socket; other invocations
+               forward to it automatically and search in-process when no
+               daemon is running
 """
 
 import argparse
-from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search, search_stack
-from design_system import generate_design_system, persist_design_system
+import json
+import os
+import sys
+# daemon is imported only to answer a query or --serve; core by
+# daemon.execute() only when no daemon answers, and design_system only for
+# --design-system; NumPy is imported by core only for corpora above
+# NUMPY_MIN_DOCS
+
+# Mirrors of core.CSV_CONFIG / core.AVAILABLE_STACKS for argparse, so the
+# daemon client starts without importing core
+DOMAINS = ["style", "prompt", "color", "chart", "landing", "product", "ux", "typography", "icons", "react", "web"]
+STACKS = ["html-tailwind", "react", "nextjs", "vue", "nuxtjs", "nuxt-ui", "svelte", "swiftui", "react-native",
+          "flutter", "shadcn", "jetpack-compose"]
 
 
 def format_output(result):
@@ -25,12 +58,28 @@ def format_output(result):
         return f"Error: {result['error']}"
 
     output = []
+    if result.get("domain") == "all":
+        sources = result["sources"] if result["sources"] == "all" else ", ".join(result["sources"])
+        output.append(f"## UI Pro Max Global Search Results")
+        output.append(f"**Sources:** {sources} | **Query:** {result['query']} | **Found:** {result['count']} results\n")
+        for i, hit in enumerate(result['results'], 1):
+            source = f"stack:{hit['stack']}" if "stack" in hit else hit['domain']
+            output.append(f"### Result {i} ({source}, score {hit['score']})")
+            for key, value in hit['result'].items():
+                value_str = str(value)
+                if len(value_str) > 300:
+                    value_str = value_str[:300] + "..."
+                output.append(f"- **{key}:** {value_str}")
+            output.append("")
+        return "\n".join(output)
+
     if result.get("stack"):
         output.append(f"## UI Pro Max Stack Guidelines")
         output.append(f"**Stack:** {result['stack']} | **Query:** {result['query']}")
     else:
         output.append(f"## UI Pro Max Search Results")
-        output.append(f"**Domain:** {result['domain']} | **Query:** {result['query']}")
+        confidence = f" | **Confidence:** {result['confidence']}" if "confidence" in result else ""
+        output.append(f"**Domain:** {result['domain']} | **Query:** {result['query']}{confidence}")
     output.append(f"**Source:** {result['file']} | **Found:** {result['count']} results\n")
 
     for i, row in enumerate(result['results'], 1):
@@ -45,12 +94,68 @@ def format_output(result):
     return "\n".join(output)
 
 
+def print_result(result, as_json=False):
+    """Print one search result (or a list of them) as markdown or JSON"""
+    if as_json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    elif isinstance(result, list):
+        print("\n".join(format_output(r) for r in result))
+    else:
+        print(format_output(result))
+
+
+def profile_startup(argv, top=15):
+    """Re-run this command under `python -X importtime` and summarize where startup goes"""
+    import subprocess
+    import time
+
+    cmd = [sys.executable, "-X", "importtime", os.path.abspath(__file__)] + argv
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    modules = []  # (name, self_us, cumulative_us, top_level)
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us), not name[1:].startswith(" ")))
+    total_import_ms = sum(m[1] for m in modules) / 1000
+
+    print("## Startup Profile")
+    print(f"**Command:** {' '.join(argv)}")
+    print(f"**Wall time:** {wall_ms:.1f} ms | **Imports:** {total_import_ms:.1f} ms across {len(modules)} modules | **Exit:** {proc.returncode}\n")
+    print("| Module (top-level) | Cumulative ms | Self ms |")
+    print("|---|---:|---:|")
+    for name, self_us, cumulative_us, _ in sorted((m for m in modules if m[3]), key=lambda m: m[2], reverse=True)[:top]:
+        print(f"| {name} | {cumulative_us / 1000:.1f} | {self_us / 1000:.1f} |")
+    return proc.returncode
+
+
+def run(request, use_daemon=True, socket_path=None):
+    """Answer a request through the search daemon when one is running, else in-process"""
+    # Unset options are left out so execute() applies core's defaults (MAX_RESULTS)
+    request = {key: value for key, value in request.items() if value is not None}
+    import daemon
+    if use_daemon:
+        try:
+            return daemon.call(request, socket_path)
+        except daemon.DaemonUnavailable:
+            pass
+        except daemon.DaemonError as e:
+            raise SystemExit(f"Error: {e}")
+    return daemon.execute(request)
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="UI Pro Max Search")
-    parser.add_argument("query", help="Search query")
-    parser.add_argument("--domain", "-d", choices=list(CSV_CONFIG.keys()), help="Search domain")
-    parser.add_argument("--stack", "-s", choices=AVAILABLE_STACKS, help="Stack-specific search (html-tailwind, react, nextjs)")
-    parser.add_argument("--max-results", "-n", type=int, default=MAX_RESULTS, help="Max results (default: 3)")
+    parser.add_argument("query", nargs="?", help="Search query")
+    parser.add_argument("--domain", "-d", choices=DOMAINS, help="Search domain")
+    parser.add_argument("--stack", "-s", choices=STACKS, help="Stack-specific search (html-tailwind, react, nextjs)")
+    parser.add_argument("--max-results", "-n", type=int, default=None, help="Max results (default: 3)")
+    parser.add_argument("--top-domains", "-t", type=int, default=None, help="Search the N best auto-detected domains at once")
+    parser.add_argument("--all", "-a", nargs="?", const="", default=None, metavar="SOURCES",
+                        help="Search all domains and stacks at once (optionally: comma-separated domains / stack:<name>)")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
     # Design system generation
     parser.add_argument("--design-system", "-ds", action="store_true", help="Generate complete design system recommendation")
@@ -58,21 +163,46 @@ if __name__ == "__main__":
     parser.add_argument("--format", "-f", choices=["ascii", "markdown"], default="ascii", help="Output format for design system")
     # Persistence (Master + Overrides pattern)
     parser.add_argument("--persist", action="store_true", help="Save design system to design-system/MASTER.md (creates hierarchical structure)")
-    parser.add_argument("--page", type=str, default=None, help="Create page-specific override file in design-system/pages/")
+    parser.add_argument("--page", type=str, action="append", default=None, help="Create page-specific override file in design-system/pages/ (repeatable)")
     parser.add_argument("--output-dir", "-o", type=str, default=None, help="Output directory for persisted files (default: current directory)")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the design system result cache")
+    parser.add_argument("--cache-stats", action="store_true", help="Show design system result cache statistics")
+    # Search daemon
+    parser.add_argument("--serve", action="store_true", help="Run the search daemon (keeps all indexes warm)")
+    parser.add_argument("--socket", type=str, default=None, help="Daemon socket path (default: $UIPRO_SEARCH_SOCKET, else a per-user runtime or temp dir)")
+    parser.add_argument("--no-daemon", action="store_true", help="Always search in-process, even if a daemon is running")
+    parser.add_argument("--profile-startup", action="store_true", help="Report wall time and per-module import time for this command")
 
     args = parser.parse_args()
 
+    if args.profile_startup:
+        profile_startup([arg for arg in sys.argv[1:] if arg != "--profile-startup"])
+        raise SystemExit(0)
+    if args.serve:
+        from daemon import serve
+        serve(args.socket)
+        raise SystemExit(0)
+    if args.cache_stats:
+        print_result(run({"op": "cache_stats"}, not args.no_daemon, args.socket), as_json=True)
+        raise SystemExit(0)
+    if args.query is None:
+        parser.error("the following arguments are required: query")
+
+    use_daemon = not args.no_daemon
+
     # Design system takes priority
     if args.design_system:
-        result = generate_design_system(
-            args.query, 
-            args.project_name, 
-            args.format,
-            persist=args.persist,
-            page=args.page,
-            output_dir=args.output_dir
-        )
+        result = run({
+            "op": "design_system",
+            "query": args.query,
+            "project_name": args.project_name,
+            "output_format": args.format,
+            "persist": args.persist,
+            "pages": args.page,
+            "use_cache": not args.no_cache,
+            # The daemon has its own working directory
+            "output_dir": os.path.abspath(args.output_dir or os.getcwd())
+        }, use_daemon, args.socket)
         print(result)
         
         # Print persistence confirmation
@@ -81,26 +211,30 @@ if __name__ == "__main__":
             print("\n" + "=" * 60)
             print(f"✅ Design system persisted to design-system/{project_slug}/")
             print(f"   📄 design-system/{project_slug}/MASTER.md (Global Source of Truth)")
-            if args.page:
-                page_filename = args.page.lower().replace(' ', '-')
-                print(f"   📄 design-system/{project_slug}/pages/{page_filename}.md (Page Overrides)")
+            for page in dict.fromkeys(page.lower().replace(' ', '-') for page in args.page or []):
+                print(f"   📄 design-system/{project_slug}/pages/{page}.md (Page Overrides)")
             print("")
             print(f"📖 Usage: When building a page, check design-system/{project_slug}/pages/[page].md first.")
             print(f"   If exists, its rules override MASTER.md. Otherwise, use MASTER.md.")
             print("=" * 60)
+    # Global search across every domain and stack
+    elif args.all is not None:
+        sources = [name.strip() for name in args.all.split(",") if name.strip()] or None
+        result = run({"op": "search_all", "query": args.query, "sources": sources, "max_results": args.max_results},
+                     use_daemon, args.socket)
+        print_result(result, args.json)
     # Stack search
     elif args.stack:
-        result = search_stack(args.query, args.stack, args.max_results)
-        if args.json:
-            import json
-            print(json.dumps(result, indent=2, ensure_ascii=False))
-        else:
-            print(format_output(result))
+        result = run({"op": "search_stack", "query": args.query, "stack": args.stack, "max_results": args.max_results},
+                     use_daemon, args.socket)
+        print_result(result, args.json)
+    # Cross-domain fan-out
+    elif args.top_domains and not args.domain:
+        results = run({"op": "search_domains", "query": args.query, "top_n": args.top_domains, "max_results": args.max_results},
+                      use_daemon, args.socket)
+        print_result(results, args.json)
     # Domain search
     else:
-        result = search(args.query, args.domain, args.max_results)
-        if args.json:
-            import json
-            print(json.dumps(result, indent=2, ensure_ascii=False))
-        else:
-            print(format_output(result))
+        result = run({"op": "search", "query": args.query, "domain": args.domain, "max_results": args.max_results},
+                     use_daemon, args.socket)
+        print_result(result, args.json)
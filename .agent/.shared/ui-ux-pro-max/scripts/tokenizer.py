@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Tokenizer - text normalization shared by indexing and queries
+"""
+
+import re
+from functools import lru_cache
+
+# ============ CONFIGURATION ============
+_NON_WORD = re.compile(r'[^\w\s]')
+MIN_TOKEN_LEN = 3
+QUERY_CACHE_SIZE = 4096
+
+# Only words that survive the MIN_TOKEN_LEN filter need listing
+STOPWORDS = frozenset("""
+all also and any are but can could did does each for from had has have her his how
+its may more most not off one our out own per she should such than that the their
+them then there these they this those too use using very was were what when where
+which while who why will with would yet you your
+""".split())
+
+
+# ============ STEMMING ============
+def stem(word):
+    """
+    Light suffix stripper (Harman's S-stemmer): folds plural forms only.
+
+    dashboards -> dashboard, galleries -> gallery, classes -> classe. The same
+    rules run on documents and queries, so the odd non-word stem still matches.
+    """
+    if len(word) > 4 and word.endswith("ies") and not word.endswith(("eies", "aies")):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("es") and not word.endswith(("aes", "ees", "oes")):
+        return word[:-1]
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("us", "ss")):
+        return word[:-1]
+    return word
+
+
+# ============ TOKENIZER ============
+def tokenize(text, use_stem=False, use_stopwords=False):
+    """Lowercase, split, remove punctuation, filter short words"""
+    words = _NON_WORD.sub(' ', str(text).lower()).split()
+    tokens = [w for w in words if len(w) >= MIN_TOKEN_LEN]
+    if use_stopwords:
+        tokens = [w for w in tokens if w not in STOPWORDS]
+    if use_stem:
+        tokens = [stem(w) for w in tokens]
+    return tokens
+
+
+@lru_cache(maxsize=QUERY_CACHE_SIZE)
+def _tokenize_query(text, use_stem, use_stopwords):
+    return tuple(tokenize(text, use_stem, use_stopwords))
+
+
+class Tokenizer:
+    """Tokenizer settings for one index; queries are memoized per setting"""
+
+    def __init__(self, stem=False, stopwords=False):
+        self.stem = stem
+        self.stopwords = stopwords
+
+    @property
+    def key(self):
+        """Hashable settings, for cache keys"""
+        return (self.stem, self.stopwords)
+
+    def to_dict(self):
+        return {"stem": self.stem, "stopwords": self.stopwords}
+
+    def tokenize(self, text):
+        return tokenize(text, self.stem, self.stopwords)
+
+    def tokenize_query(self, query):
+        """Memoized tokenize() for query strings; returns a tuple"""
+        return _tokenize_query(str(query), self.stem, self.stopwords)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Check Cache - Antigravity Kit
+=============================
+
+Persistent per-file results for validation scanners.
+
+A scanner's per-file analysis depends only on the file's contents, the
+scanner's code and its rule tables. CheckCache keeps each file's result in
+<project>/.agent/.cache/<check>.json, keyed by content hash, check version
+(hash of the scanner's source) and rule-set hash: a rerun analyzes only files
+whose contents changed and reuses the cached result for the rest. A file is
+only re-hashed when its size or mtime changed, so an unchanged tree is never
+read at all.
+
+The runners enable caching by setting $AGENT_CHECK_CACHE to the cache
+directory (--no-cache turns it off); a scanner started on its own analyzes
+every file, as before.
+
+Usage:
+    cache = CheckCache.open("seo_checker", project_path, __file__, rules=SKIP_PATTERNS)
+    for path in files:
+        result = cache.run(path, check_page)   # check_page(path) -> JSON-serializable
+    cache.save()
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from project_index import get_index
+
+CACHE_ENV = "AGENT_CHECK_CACHE"  # Cache directory published by the runner
+CACHE_DIR = ".agent/.cache"      # Relative to the verified project
+CACHE_FORMAT = 1
+
+PathLike = Union[str, Path]
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _plain(value: Any) -> Any:
+    """Fresh JSON-shaped copy (tuples become lists), so cold and warm runs return the same"""
+    return json.loads(json.dumps(value))
+
+
+class CheckCache:
+    """Per-file results of one check; a no-op unless the runner enabled caching"""
+
+    def __init__(self, path: Optional[str], project_path: PathLike, key: dict):
+        self.path = path
+        self.index = get_index(project_path)
+        self.key = key
+        self.entries = {}  # rel path -> {"size", "mtime", "hash", "result"}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        if path:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("key") == key:
+                    self.entries = data["files"]
+            except (OSError, ValueError, KeyError):
+                pass
+
+    @classmethod
+    def open(cls, check: str, project_path: PathLike, script: PathLike, rules: Any = None) -> "CheckCache":
+        """Cache of `check` for project_path; the version is the hash of `script`"""
+        directory = os.environ.get(CACHE_ENV)
+        with open(script, "rb") as f:
+            version = _sha256(f.read())
+        key = {
+            "format": CACHE_FORMAT,
+            "version": version,
+            "rules": _sha256(repr(rules).encode("utf-8")),
+        }
+        return cls(os.path.join(directory, f"{check}.json") if directory else None, project_path, key)
+
+    def run(self, path: PathLike, analyze: Callable[[PathLike], Any]) -> Any:
+        """analyze(path), or its cached result when the file's contents are unchanged"""
+        if self.path is None:
+            return _plain(analyze(path))
+
+        rel = self.index.relpath(path)
+        entry = self.entries.get(rel)
+        try:
+            indexed = self.index.by_path.get(rel)
+            if indexed is not None:
+                size, mtime = indexed["size"], indexed["mtime"]
+            else:
+                st = os.stat(path)
+                size, mtime = st.st_size, st.st_mtime_ns
+            if entry is not None and (entry["size"], entry["mtime"]) == (size, mtime):
+                self.hits += 1
+                return _plain(entry["result"])
+            digest = self.index.content_hash(path)
+        except OSError:
+            # Unreadable: let the scanner report it, and don't cache that
+            return _plain(analyze(path))
+
+        if entry is not None and entry["hash"] == digest:
+            # Touched but not changed
+            entry["size"], entry["mtime"] = size, mtime
+            self._dirty = True
+            self.hits += 1
+            return _plain(entry["result"])
+
+        result = _plain(analyze(path))
+        self.entries[rel] = {"size": size, "mtime": mtime, "hash": digest, "result": result}
+        self._dirty = True
+        self.misses += 1
+        return _plain(result)
+
+    def save(self):
+        """Write the cache back if anything changed, dropping files that no longer exist"""
+        if self.path is None or not self._dirty:
+            return
+        root = self.index.root
+        files = {rel: e for rel, e in self.entries.items() if os.path.exists(os.path.join(root, rel))}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"key": self.key, "files": files}, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
+        self._dirty = False
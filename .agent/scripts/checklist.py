@@ -18,14 +18,32 @@ Priority Order:
     P4: UX Audit (psychology laws, accessibility)
     P5: SEO Check (meta tags, structure)
     P6: Performance (lighthouse - requires URL)
+
+Core checks run in parallel on a worker pool (see scheduler.py), results are
+printed in priority order. Scanners run in-process on warm plugin workers
+(see plugin_host.py); --subprocess runs each in its own interpreter. When a
+required check (P0/P1) fails, optional checks still running are cancelled
+and the checklist stops.
+The project is walked once per run (see project_index.py) and the file index
+is shared by every scanner.
+Per-file scanner results are cached in .agent/.cache/ (see check_cache.py), so
+a rerun only reanalyzes changed files; --changed-since <git-ref> limits
+per-file analysis to files changed since that ref (cross-file checks such as
+locale completeness still see the whole tree).
 """
 
+import os
 import sys
-import subprocess
+import time
 import argparse
 from pathlib import Path
 from typing import List, Tuple, Optional
 
+from scheduler import build_graph, run_graph, default_workers
+from plugin_host import WorkerPool, run_check_script
+from project_index import MMAP_ENV, changed_files, shared_index
+from check_cache import CACHE_DIR, CACHE_ENV
+
 # ANSI colors for terminal output
 class Colors:
     HEADER = '\033[95m'
@@ -73,75 +91,96 @@ def check_script_exists(script_path: Path) -> bool:
     """Check if script file exists"""
     return script_path.exists() and script_path.is_file()
 
-def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None) -> dict:
+def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None, cancel=None,
+               pool: Optional[WorkerPool] = None) -> dict:
     """
-    Run a validation script and capture results
+    Run a validation script and capture results (quietly: print_check() reports them)
     
     Returns:
-        dict with keys: name, passed, output, skipped
+        dict with keys: name, passed, output, skipped, duration[, cancelled]
     """
     if not check_script_exists(script_path):
-        print_warning(f"{name}: Script not found, skipping")
-        return {"name": name, "passed": True, "output": "", "skipped": True}
+        return {"name": name, "passed": True, "output": "", "skipped": True, "duration": 0}
     
-    print_step(f"Running: {name}")
-    
-    # Build command
-    cmd = ["python", str(script_path), project_path]
+    # Build arguments
+    args = [project_path]
     if url and ("lighthouse" in script_path.name.lower() or "playwright" in script_path.name.lower()):
-        cmd.append(url)
+        args.append(url)
     
-    # Run script
+    # Run in-process on a warm plugin worker (or its own subprocess), in its own
+    # process group either way, so a cancelled check takes its children with it
+    start = time.monotonic()
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
-        )
-        
-        passed = result.returncode == 0
+        result = run_check_script(str(script_path), args, 300, cancel, pool)  # 5 minute timeout
+        duration = time.monotonic() - start
         
-        if passed:
-            print_success(f"{name}: PASSED")
-        else:
-            print_error(f"{name}: FAILED")
-            if result.stderr:
-                print(f"  Error: {result.stderr[:200]}")
+        if result["cancelled"]:
+            return {"name": name, "passed": False, "output": result["stdout"], "error": "Cancelled",
+                    "skipped": True, "cancelled": True, "duration": duration}
+        if result["timeout"]:
+            return {"name": name, "passed": False, "output": "", "error": "Timeout", "skipped": False,
+                    "timeout": True, "duration": duration}
         
         return {
             "name": name,
-            "passed": passed,
-            "output": result.stdout,
-            "error": result.stderr,
-            "skipped": False
+            "passed": result["returncode"] == 0,
+            "output": result["stdout"],
+            "error": result["stderr"],
+            "skipped": False,
+            "duration": duration
         }
     
-    except subprocess.TimeoutExpired:
-        print_error(f"{name}: TIMEOUT (>5 minutes)")
-        return {"name": name, "passed": False, "output": "", "error": "Timeout", "skipped": False}
-    
     except Exception as e:
-        print_error(f"{name}: ERROR - {str(e)}")
-        return {"name": name, "passed": False, "output": "", "error": str(e), "skipped": False}
+        return {"name": name, "passed": False, "output": "", "error": str(e), "skipped": False,
+                "exception": True, "duration": time.monotonic() - start}
+
+def print_check(result: dict):
+    """Print one check's buffered result"""
+    name = result["name"]
+    if result.get("cancelled"):
+        print_warning(f"{name}: CANCELLED after {result['duration']:.1f}s (required check failed)")
+        return
+    if result.get("skipped"):
+        print_warning(f"{name}: Script not found, skipping")
+        return
+    print_step(f"Running: {name}")
+    if result.get("timeout"):
+        print_error(f"{name}: TIMEOUT (>5 minutes)")
+    elif result.get("exception"):
+        print_error(f"{name}: ERROR - {result['error']}")
+    elif result["passed"]:
+        print_success(f"{name}: PASSED")
+    else:
+        print_error(f"{name}: FAILED")
+        if result.get("error"):
+            print(f"  Error: {result['error'][:200]}")
 
-def print_summary(results: List[dict]):
+def print_summary(results: List[dict], wall_time: Optional[float] = None):
     """Print final summary report"""
     print_header("📊 CHECKLIST SUMMARY")
     
     passed_count = sum(1 for r in results if r["passed"] and not r.get("skipped"))
     failed_count = sum(1 for r in results if not r["passed"] and not r.get("skipped"))
-    skipped_count = sum(1 for r in results if r.get("skipped"))
+    cancelled_count = sum(1 for r in results if r.get("cancelled"))
+    skipped_count = sum(1 for r in results if r.get("skipped") and not r.get("cancelled"))
     
     print(f"Total Checks: {len(results)}")
     print(f"{Colors.GREEN}✅ Passed: {passed_count}{Colors.ENDC}")
     print(f"{Colors.RED}❌ Failed: {failed_count}{Colors.ENDC}")
     print(f"{Colors.YELLOW}⏭️  Skipped: {skipped_count}{Colors.ENDC}")
+    if cancelled_count:
+        print(f"{Colors.YELLOW}⏹️  Cancelled: {cancelled_count}{Colors.ENDC}")
+    if wall_time is not None:
+        # Serial time is a lower bound: cancelled checks only count until they were killed
+        serial_time = sum(r.get("duration", 0) for r in results)
+        print(f"Time: {wall_time:.1f}s (serial: {serial_time:.1f}s, saved: {max(0.0, serial_time - wall_time):.1f}s)")
     print()
     
     # Detailed results
     for r in results:
-        if r.get("skipped"):
+        if r.get("cancelled"):
+            status = f"{Colors.YELLOW}⏹️ {Colors.ENDC}"
+        elif r.get("skipped"):
             status = f"{Colors.YELLOW}⏭️ {Colors.ENDC}"
         elif r["passed"]:
             status = f"{Colors.GREEN}✅{Colors.ENDC}"
@@ -159,6 +198,18 @@ def print_summary(results: List[dict]):
         print_success("All checks PASSED ✨")
         return True
 
+def select_changed(project_path: Path, ref: Optional[str]) -> Optional[List[str]]:
+    """Files changed since the --changed-since ref (None: scan everything); exits if git fails"""
+    if not ref:
+        return None
+    try:
+        changed = changed_files(project_path, ref)
+    except (OSError, ValueError) as e:
+        print_error(f"--changed-since {ref}: {e}")
+        sys.exit(1)
+    print(f"Changed since {ref}: {len(changed)} file(s)")
+    return changed
+
 def main():
     parser = argparse.ArgumentParser(
         description="Run Antigravity Kit validation checklist",
@@ -172,10 +223,20 @@ Examples:
     parser.add_argument("project", help="Project path to validate")
     parser.add_argument("--url", help="URL for performance checks (lighthouse, playwright)")
     parser.add_argument("--skip-performance", action="store_true", help="Skip performance checks even if URL provided")
+    parser.add_argument("--workers", type=int, default=default_workers(), help="Checks to run in parallel (default: CPU count, 1 = serial)")
+    parser.add_argument("--subprocess", action="store_true", help="Run every check in its own Python interpreter (no warm plugin workers)")
+    parser.add_argument("--mmap", action="store_true", help="Memory-map large project files instead of reading them")
+    parser.add_argument("--changed-since", metavar="GIT_REF", help="Analyze only files changed since GIT_REF (git diff + untracked files)")
+    parser.add_argument("--no-cache", action="store_true", help=f"Reanalyze every file instead of reusing results cached in {CACHE_DIR}/")
     
     args = parser.parse_args()
     
     project_path = Path(args.project).resolve()
+    if args.mmap:
+        os.environ[MMAP_ENV] = "1"
+    if not args.no_cache:
+        # Scanners reuse per-file results for files whose contents are unchanged
+        os.environ[CACHE_ENV] = str(project_path / CACHE_DIR)
     
     if not project_path.exists():
         print_error(f"Project path does not exist: {project_path}")
@@ -184,32 +245,52 @@ Examples:
     print_header("🚀 ANTIGRAVITY KIT - MASTER CHECKLIST")
     print(f"Project: {project_path}")
     print(f"URL: {args.url if args.url else 'Not provided (performance checks skipped)'}")
+    changed = select_changed(project_path, args.changed_since)
+    
+    # Core checks all start together; performance checks run alone, after them.
+    # Only core checks stop the checklist when they fail.
+    suite = [{"category": "core", "checks": CORE_CHECKS}]
+    if args.url and not args.skip_performance:
+        suite.append({
+            "category": "performance",
+            "exclusive": True,
+            "checks": [(name, script, False) for name, script, _ in PERFORMANCE_CHECKS]
+        })
+    headers = {"core": "📋 CORE CHECKS", "performance": "⚡ PERFORMANCE CHECKS"}
+    printed_categories = set()
     
-    results = []
+    def report(result: dict):
+        if result["category"] not in printed_categories:
+            printed_categories.add(result["category"])
+            print_header(headers[result["category"]])
+        print_check(result)
     
-    # Run core checks
-    print_header("📋 CORE CHECKS")
-    for name, script_path, required in CORE_CHECKS:
-        script = project_path / script_path
-        result = run_script(name, script, str(project_path))
-        results.append(result)
-        
-        # If required check fails, stop
-        if required and not result["passed"] and not result.get("skipped"):
-            print_error(f"CRITICAL: {name} failed. Stopping checklist.")
-            print_summary(results)
-            sys.exit(1)
+    pool = None if args.subprocess else WorkerPool(args.workers)
     
-    # Run performance checks if URL provided
-    if args.url and not args.skip_performance:
-        print_header("⚡ PERFORMANCE CHECKS")
-        for name, script_path, required in PERFORMANCE_CHECKS:
-            script = project_path / script_path
-            result = run_script(name, script, str(project_path), args.url)
-            results.append(result)
+    def run_check(node: dict) -> dict:
+        return run_script(node["name"], project_path / node["script"], str(project_path), args.url, node["cancel"], pool)
+    
+    start = time.monotonic()
+    nodes = build_graph(suite)
+    # Walk the project once; every check loads this index instead of walking again
+    with shared_index(project_path, changed=changed):
+        try:
+            results, stopped = run_graph(nodes, run_check, args.workers, stop_on_fail=True, report=report, cancel_optional=True)
+        finally:
+            if pool:
+                pool.close()
+    wall_time = time.monotonic() - start
+    
+    # If required check fails, stop
+    if stopped:
+        required = {node["name"] for node in nodes if node["required"]}
+        failed = next(r for r in results if r["name"] in required and not r["passed"] and not r.get("skipped"))
+        print_error(f"CRITICAL: {failed['name']} failed. Stopping checklist.")
+        print_summary(results, wall_time)
+        sys.exit(1)
     
     # Print summary
-    all_passed = print_summary(results)
+    all_passed = print_summary(results, wall_time)
     
     sys.exit(0 if all_passed else 1)
 
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Plugin Host - Antigravity Kit
+=============================
+
+Runs validation scripts in-process instead of one interpreter per check.
+
+A validation script is a plugin when it defines main(), reads its arguments
+from sys.argv and reports through its exit code - every skill scanner except
+the Lighthouse and Playwright runners. run_plugin() loads it once per process,
+calls main() with the check's argv and captures stdout/stderr at the file
+descriptor level, so output of tools it spawns is captured too.
+
+WorkerPool keeps warm host processes (this file, run as a script) that run one
+plugin at a time over a JSON-lines pipe, so interpreter startup and shared
+imports are paid once per worker instead of once per check. Each worker has
+its own process group: a timed-out or cancelled check is killed like a
+subprocess check. Scripts that are not plugins fall back to run_command().
+
+Usage:
+    from plugin_host import WorkerPool, run_check_script
+    with WorkerPool(4) as pool:
+        result = run_check_script(script, [project_path], timeout=300, pool=pool)
+"""
+
+import importlib.util
+import json
+import os
+import queue
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import List, Optional
+
+from scheduler import POLL_INTERVAL, run_command, _kill_group
+
+
+class NotAPlugin(Exception):
+    """The script has no main() to call in-process"""
+
+
+# ============ IN-PROCESS EXECUTION ============
+_modules = {}  # (path, mtime_ns) -> loaded module
+
+
+def load_plugin(script: str):
+    """Import a validation script once per process (reloaded when it changes)"""
+    path = Path(script).resolve()
+    key = (str(path), path.stat().st_mtime_ns)
+    if key not in _modules:
+        name = "check_plugin_" + str(abs(hash(key[0])))
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.path.insert(0, str(path.parent))
+        try:
+            spec.loader.exec_module(module)
+        finally:
+            sys.path.remove(str(path.parent))
+        _modules[key] = module
+    module = _modules[key]
+    if not callable(getattr(module, "main", None)):
+        raise NotAPlugin(script)
+    return module
+
+
+def _exit_code(code) -> int:
+    """Exit status for a SystemExit code, as the interpreter would report it"""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def run_plugin(script: str, args: List[str]) -> dict:
+    """
+    Call a plugin's main() with sys.argv = [script] + args in this process.
+
+    Returns {"returncode", "stdout", "stderr"}. Not thread-safe: argv and the
+    standard file descriptors are process-wide, so run one plugin at a time.
+    """
+    script_dir = str(Path(script).resolve().parent)
+
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err, open(os.devnull, "rb") as null:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        saved_fds = [os.dup(fd) for fd in (0, 1, 2)]
+        saved_argv = sys.argv
+        os.dup2(null.fileno(), 0)
+        os.dup2(out.fileno(), 1)
+        os.dup2(err.fileno(), 2)
+        sys.argv = [script] + list(args)
+        sys.path.insert(0, script_dir)
+        returncode = 0
+        try:
+            # Loaded with output redirected too: import-time prints belong to the check
+            load_plugin(script).main()
+        except SystemExit as e:
+            returncode = _exit_code(e.code)
+        except NotAPlugin:
+            raise
+        except Exception:
+            traceback.print_exc()
+            returncode = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            for fd, saved in zip((0, 1, 2), saved_fds):
+                os.dup2(saved, fd)
+                os.close(saved)
+            sys.argv = saved_argv
+            sys.path.remove(script_dir)
+
+        out.seek(0)
+        err.seek(0)
+        return {
+            "returncode": returncode,
+            "stdout": out.read().decode("utf-8", errors="replace"),
+            "stderr": err.read().decode("utf-8", errors="replace"),
+        }
+
+
+def serve():
+    """Worker loop: one JSON request per stdin line, one JSON response per stdout line"""
+    # Responses get a private copy of stdout; fd 1 itself only ever carries plugin output
+    channel = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    with open(os.devnull, "wb") as null:
+        os.dup2(null.fileno(), 1)
+    for line in sys.stdin.buffer:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        try:
+            response = run_plugin(request["script"], request["args"])
+        except NotAPlugin:
+            response = {"unsupported": True}
+        except Exception as e:
+            # The script could not even be loaded: let the caller run it as a subprocess
+            response = {"unsupported": True, "error": f"{type(e).__name__}: {e}"}
+        channel.write(json.dumps(response) + "\n")
+        channel.flush()
+
+
+# ============ WARM WORKER POOL ============
+class WorkerPool:
+    """Warm plugin host processes; each runs one check at a time"""
+
+    def __init__(self, size: int):
+        self.size = max(1, size)
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _spawn(self) -> dict:
+        if os.name == "posix":
+            group = {"start_new_session": True}
+        else:
+            group = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+        env = dict(os.environ, PYTHONIOENCODING="utf-8")
+        proc = subprocess.Popen([sys.executable, os.path.abspath(__file__)], stdin=subprocess.PIPE,
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env, **group)
+        lines = queue.Queue()
+
+        def pump():
+            for line in proc.stdout:
+                lines.put(line)
+            lines.put(None)
+
+        threading.Thread(target=pump, daemon=True).start()
+        return {"proc": proc, "lines": lines}
+
+    def _acquire(self) -> dict:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._spawn()
+
+    def _release(self, worker: dict):
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(worker)
+                return
+        self._stop(worker)
+
+    @staticmethod
+    def _stop(worker: dict):
+        try:
+            worker["proc"].stdin.close()
+            worker["proc"].wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            _kill_group(worker["proc"])
+
+    def run(self, script: str, args: List[str], timeout: float, cancel: Optional[threading.Event] = None) -> Optional[dict]:
+        """
+        Run a plugin on a warm worker. Returns the same dict as run_command(),
+        or None if the script is not a plugin.
+        """
+        worker = self._acquire()
+        proc = worker["proc"]
+        try:
+            proc.stdin.write((json.dumps({"script": script, "args": list(args)}) + "\n").encode("utf-8"))
+            proc.stdin.flush()
+        except OSError:
+            _kill_group(proc)
+            return None
+
+        deadline = time.monotonic() + timeout
+        outcome = {"timeout": False, "cancelled": False}
+        while True:
+            try:
+                line = worker["lines"].get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                if cancel is not None and cancel.is_set():
+                    outcome["cancelled"] = True
+                elif time.monotonic() >= deadline:
+                    outcome["timeout"] = True
+                else:
+                    continue
+                # The worker is mid-check: kill it with everything it spawned
+                _kill_group(proc)
+                return {"returncode": -9, "stdout": "", "stderr": "", **outcome}
+            break
+
+        if line is None:
+            # The worker died (e.g. the plugin called os._exit); don't reuse it
+            return {"returncode": proc.wait(), "stdout": "", "stderr": "Plugin worker exited unexpectedly", **outcome}
+        response = json.loads(line)
+        self._release(worker)
+        if response.get("unsupported"):
+            return None
+        return {**response, **outcome}
+
+    def close(self):
+        """Stop every idle worker"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            self._stop(worker)
+
+
+def run_check_script(script: str, args: List[str], timeout: float, cancel: Optional[threading.Event] = None,
+                     pool: Optional[WorkerPool] = None) -> dict:
+    """Run a validation script on the plugin pool when possible, else as its own subprocess"""
+    if pool is not None:
+        result = pool.run(script, args, timeout, cancel)
+        if result is not None:
+            return result
+    return run_command(["python", script] + list(args), timeout, cancel)
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Project Index - Antigravity Kit
+===============================
+
+Walks a project tree once and hands the file list to every scanner.
+
+Each scanner used to walk the project on its own (security_scan.py alone
+walked it three times), each with its own skip list. ProjectIndex.build()
+walks once with the unified SKIP_DIRS and records path, extension, size and
+mtime per file; content hashes are computed on demand and kept with the
+entry. File contents are read once per process and memoized, so scanners
+sharing a plugin worker (see plugin_host.py) also share reads; large files
+can be memory-mapped instead of read.
+
+The runners build the index once per run and publish it through
+$AGENT_PROJECT_INDEX (a JSON file), so plugin workers and subprocess checks
+load it instead of walking again. Plugin workers run from this directory,
+so scanners import project_index and check_cache directly; a scanner started
+on its own (or with --subprocess) adds the directory to sys.path itself and
+builds the index once per process.
+
+With --changed-since <git-ref>, the runners still publish every file, and
+mark the ones changed since that ref (changed_files(): git diff plus untracked
+files). Scanners list files with changed_only=True for per-file analysis, so
+only changed files are analyzed; cross-file checks (e.g. locale completeness)
+list the whole tree.
+
+Usage:
+    from project_index import project_files, read_text
+    for path in project_files(project_path, "**/*.tsx", changed_only=True):
+        content = read_text(path)
+
+    with shared_index(project_path, changed=changed_files(project_path, "main")):   # in a runner
+        ...run checks...
+"""
+
+import fnmatch
+import hashlib
+import json
+import mmap
+import os
+import re
+import subprocess
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+INDEX_ENV = "AGENT_PROJECT_INDEX"      # Path of the index published by the runner
+MMAP_ENV = "AGENT_INDEX_MMAP"          # "1": memory-map large files instead of reading them
+INDEX_VERSION = 2
+MMAP_MIN_SIZE = 1024 * 1024            # Bytes; smaller files are cheaper to read()
+CONTENT_CACHE_BYTES = 64 * 1024 * 1024  # Memoized file contents per process
+
+# Union of the skip lists the scanners used to carry: dependencies, VCS
+# metadata, virtualenvs, build output, tool caches (including the
+# check cache in .agent/.cache) and editor state. Scanner-specific
+# exclusions (tests, docs, native mobile folders...) stay in the scanners.
+SKIP_DIRS = frozenset({
+    'node_modules', '.git', 'dist', 'build', '__pycache__', '.venv', 'venv',
+    '.next', '.idea', '.vscode', 'coverage', '.cache',
+})
+
+PathLike = Union[str, Path]
+
+
+# ============ GLOB MATCHING ============
+_compiled = {}  # pattern -> list of compiled segments (None for "**")
+
+
+def _compile(pattern: str) -> list:
+    if pattern not in _compiled:
+        flags = re.IGNORECASE if os.name == "nt" else 0  # As pathlib matches on each platform
+        _compiled[pattern] = [None if part == "**" else re.compile(fnmatch.translate(part), flags)
+                              for part in pattern.split("/") if part]
+    return _compiled[pattern]
+
+
+def _match(segments: list, parts: List[str]) -> bool:
+    """pathlib glob semantics: "**" matches zero or more directories"""
+    if not segments:
+        return not parts
+    head = segments[0]
+    if head is None:
+        # A trailing "**" only matches directories, never a file
+        return any(_match(segments[1:], parts[i:]) for i in range(len(parts)))
+    return bool(parts) and head.match(parts[0]) is not None and _match(segments[1:], parts[1:])
+
+
+# ============ FILE CONTENTS ============
+_contents = OrderedDict()  # (abs path, errors) -> str, LRU bounded by CONTENT_CACHE_BYTES
+_contents_size = 0
+_contents_lock = threading.Lock()
+
+
+def _use_mmap() -> bool:
+    return os.environ.get(MMAP_ENV) == "1"
+
+
+def _decode(path: PathLike, errors: str) -> str:
+    with open(path, "rb") as f:
+        if _use_mmap() and os.fstat(f.fileno()).st_size >= MMAP_MIN_SIZE:
+            # Decoded straight from the mapping: no intermediate bytes copy
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return str(mm, "utf-8", errors)
+        return f.read().decode("utf-8", errors)
+
+
+def read_text(path: PathLike, errors: str = "ignore") -> str:
+    """
+    File contents as open(path, encoding="utf-8", errors=errors).read()
+    returns them (universal newlines), memoized per process so scanners
+    sharing a worker read each file once.
+    """
+    global _contents_size
+    key = (os.path.abspath(path), errors)
+    with _contents_lock:
+        if key in _contents:
+            _contents.move_to_end(key)
+            return _contents[key]
+    text = _decode(path, errors)
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    with _contents_lock:
+        if key not in _contents and len(text) <= CONTENT_CACHE_BYTES // 4:
+            _contents[key] = text
+            _contents_size += len(text)
+            while _contents_size > CONTENT_CACHE_BYTES:
+                _, evicted = _contents.popitem(last=False)
+                _contents_size -= len(evicted)
+    return text
+
+
+# ============ PROJECT INDEX ============
+class ProjectIndex:
+    """File list of one project tree, with content hashes on demand"""
+
+    def __init__(self, root: PathLike, entries: List[dict], skip_dirs: Iterable[str] = SKIP_DIRS,
+                 changed: Optional[Iterable[str]] = None):
+        self.root = os.path.abspath(root)
+        self.base = Path(root)  # Paths are handed out relative to the caller's spelling of root
+        self.skip_dirs = frozenset(skip_dirs)
+        self.entries = entries
+        self.by_path: Dict[str, dict] = {e["path"]: e for e in entries}
+        self.changed = None if changed is None else frozenset(changed)  # None: every file counts as changed
+
+    @classmethod
+    def build(cls, root: PathLike, skip_dirs: Iterable[str] = SKIP_DIRS) -> "ProjectIndex":
+        """Walk root once (top-down, directory order) and stat every file"""
+        skip_dirs = frozenset(skip_dirs)
+        top = os.path.abspath(root)
+        entries = []
+        for dirpath, dirs, files in os.walk(top):
+            dirs[:] = [d for d in dirs if d not in skip_dirs]
+            rel_dir = os.path.relpath(dirpath, top)
+            for name in files:
+                full = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(full)
+                except OSError:
+                    continue
+                rel = name if rel_dir == "." else f"{rel_dir}/{name}".replace(os.sep, "/")
+                entries.append({
+                    "path": rel,
+                    "ext": os.path.splitext(name)[1].lower(),
+                    "size": st.st_size,
+                    "mtime": st.st_mtime_ns,
+                    "hash": None,
+                })
+        return cls(root, entries, skip_dirs)
+
+    def rebased(self, base: PathLike) -> "ProjectIndex":
+        """The same index, handing out paths under another spelling of root"""
+        view = object.__new__(ProjectIndex)
+        view.__dict__.update(self.__dict__)
+        view.base = Path(base)
+        return view
+
+    def with_changed(self, paths: Iterable[str]) -> "ProjectIndex":
+        """The same index, with only the given relative paths marked as changed"""
+        view = self.rebased(self.base)
+        view.changed = frozenset(paths)
+        return view
+
+    # ---------- Persistence ----------
+    def to_dict(self) -> dict:
+        return {
+            "version": INDEX_VERSION,
+            "root": self.root,
+            "skip_dirs": sorted(self.skip_dirs),
+            "files": [[e["path"], e["size"], e["mtime"], e["hash"]] for e in self.entries],
+            "changed": None if self.changed is None else sorted(self.changed),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, base: Optional[PathLike] = None) -> "ProjectIndex":
+        entries = [{"path": p, "ext": os.path.splitext(p)[1].lower(), "size": size, "mtime": mtime, "hash": digest}
+                   for p, size, mtime, digest in data["files"]]
+        return cls(base or data["root"], entries, data["skip_dirs"], data["changed"])
+
+    def save(self, path: PathLike):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+
+    # ---------- Listing ----------
+    def _path(self, rel: str) -> Path:
+        return self.base.joinpath(*rel.split("/"))
+
+    def _entries(self, changed_only: bool) -> Iterable[dict]:
+        if not changed_only or self.changed is None:
+            return self.entries
+        return (e for e in self.entries if e["path"] in self.changed)
+
+    def files(self, extensions: Optional[Iterable[str]] = None, changed_only: bool = False) -> Iterator[Path]:
+        """Every indexed file, in walk order; extensions like {".ts", ".tsx"} filter by suffix"""
+        wanted = None if extensions is None else {ext.lower() for ext in extensions}
+        for e in self._entries(changed_only):
+            if wanted is None or e["ext"] in wanted:
+                yield self._path(e["path"])
+
+    def glob(self, pattern: str, changed_only: bool = False) -> Iterator[Path]:
+        """Indexed files matching a pathlib-style pattern ("**/*.html", "**/prisma/schema.prisma")"""
+        segments = _compile(pattern)
+        for e in self._entries(changed_only):
+            if _match(segments, e["path"].split("/")):
+                yield self._path(e["path"])
+
+    # ---------- Hashes ----------
+    def relpath(self, path: PathLike) -> str:
+        return os.path.relpath(os.path.abspath(path), self.root).replace(os.sep, "/")
+
+    def content_hash(self, path: PathLike) -> str:
+        """sha256 of the file's bytes, recorded on its entry"""
+        entry = self.by_path.get(self.relpath(path))
+        if entry is not None and entry["hash"]:
+            return entry["hash"]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            if _use_mmap() and os.fstat(f.fileno()).st_size >= MMAP_MIN_SIZE:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    digest.update(mm)
+            else:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(block)
+        if entry is not None:
+            entry["hash"] = digest.hexdigest()
+        return digest.hexdigest()
+
+
+# ============ SHARED INDEX ============
+_indexes: Dict[str, ProjectIndex] = {}  # abs root -> index, per process
+_indexes_lock = threading.Lock()
+
+
+def _published(root: str) -> Optional[ProjectIndex]:
+    """The runner's index for root, if one was published through $AGENT_PROJECT_INDEX"""
+    path = os.environ.get(INDEX_ENV)
+    if not path:
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != INDEX_VERSION or data.get("root") != root:
+        return None
+    return ProjectIndex.from_dict(data)
+
+
+def get_index(project_path: PathLike) -> ProjectIndex:
+    """The index of project_path: published by the runner, else built once per process"""
+    root = os.path.abspath(project_path)
+    with _indexes_lock:
+        if root not in _indexes:
+            _indexes[root] = _published(root) or ProjectIndex.build(root)
+        index = _indexes[root]
+    return index.rebased(project_path)
+
+
+def project_files(project_path: PathLike, pattern: Optional[str] = None,
+                  extensions: Optional[Iterable[str]] = None, changed_only: bool = False) -> Iterator[Path]:
+    """
+    Files of project_path from its shared index, in walk order: those matching
+    a pathlib-style pattern, else those with one of the extensions, else all.
+    With changed_only, just the files the runner marked as changed (all of
+    them without --changed-since): use it for per-file analysis.
+    """
+    index = get_index(project_path)
+    if pattern is not None:
+        return index.glob(pattern, changed_only)
+    return index.files(extensions, changed_only)
+
+
+def changed_files(project_path: PathLike, ref: str) -> List[str]:
+    """
+    Paths (relative to project_path) changed since the git ref: committed,
+    staged and unstaged changes, plus untracked files. Raises ValueError
+    when git fails (not a repository, unknown ref).
+    """
+    def git(*args: str) -> str:
+        proc = subprocess.run(["git", *args], cwd=str(project_path), capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise ValueError(proc.stderr.strip() or f"git {args[0]} failed")
+        return proc.stdout
+
+    git("rev-parse", "--verify", f"{ref}^{{commit}}")  # Outside a repository, git diff would not fail
+    output = git("diff", "--name-only", "--relative", "-z", ref, "--")
+    output += git("ls-files", "--others", "--exclude-standard", "-z")
+    return [p for p in output.split("\0") if p]
+
+
+@contextmanager
+def shared_index(project_path: PathLike, changed: Optional[Iterable[str]] = None):
+    """
+    Build the index of project_path and publish it to checks started inside
+    the block. The whole tree is always published; changed (relative paths,
+    e.g. from changed_files()) marks the files per-file analysis is limited to.
+    """
+    index = get_index(project_path)
+    if changed is not None:
+        index = index.with_changed(changed)
+    fd, path = tempfile.mkstemp(prefix="project-index-", suffix=".json")
+    os.close(fd)
+    previous = os.environ.get(INDEX_ENV)
+    try:
+        index.save(path)
+        os.environ[INDEX_ENV] = path
+        yield index
+    finally:
+        if previous is None:
+            os.environ.pop(INDEX_ENV, None)
+        else:
+            os.environ[INDEX_ENV] = previous
+        os.remove(path)
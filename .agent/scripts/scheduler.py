@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Check Scheduler - Antigravity Kit
+=================================
+
+Runs validation checks as a dependency graph on a worker pool.
+
+Checks of a "gate" category (Security, Code Quality) block every later
+check; checks between two gates are independent and run concurrently.
+Checks of an "exclusive" category (Performance) are barriers: they start
+once every earlier check has finished, run one at a time, and later checks
+wait for them, so their measurements are not skewed by other scanners.
+
+Results are reported in suite order as soon as every earlier check has
+finished, so output is the same however the pool interleaves the work.
+
+With fail-fast cancellation, a failed required check also cancels the
+optional checks still in flight: run_command() starts each check in its
+own process group, and the whole group is killed.
+
+Usage:
+    from scheduler import build_graph, run_graph
+    nodes = build_graph(VERIFICATION_SUITE)
+    results, stopped = run_graph(nodes, run_check, workers=4, report=print_result)
+"""
+
+import os
+import signal
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Optional, Tuple
+
+POLL_INTERVAL = 0.1  # Seconds between cancellation checks of a running command
+
+
+def default_workers() -> int:
+    """Worker pool size: one per CPU"""
+    return os.cpu_count() or 1
+
+
+def _kill_group(proc: subprocess.Popen):
+    """Kill a command started by run_command() together with its children"""
+    try:
+        if os.name == "posix":
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def run_command(cmd: List[str], timeout: float, cancel: Optional[threading.Event] = None) -> dict:
+    """
+    Run cmd in its own process group, capturing output.
+
+    Returns {"returncode", "stdout", "stderr", "timeout", "cancelled"}; on
+    timeout or when cancel is set, the process group is killed.
+    """
+    if os.name == "posix":
+        group = {"start_new_session": True}
+    else:
+        group = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, **group)
+    deadline = time.monotonic() + timeout
+    outcome = {"timeout": False, "cancelled": False}
+    while True:
+        try:
+            stdout, stderr = proc.communicate(timeout=POLL_INTERVAL)
+            break
+        except subprocess.TimeoutExpired:
+            if cancel is not None and cancel.is_set():
+                outcome["cancelled"] = True
+            elif time.monotonic() >= deadline:
+                outcome["timeout"] = True
+            else:
+                continue
+            _kill_group(proc)
+            stdout, stderr = proc.communicate()
+            break
+    return {"returncode": proc.returncode, "stdout": stdout, "stderr": stderr, **outcome}
+
+
+def build_graph(suite: List[dict]) -> List[dict]:
+    """
+    Turn a suite (list of {"category", "checks", ["gate"], ["exclusive"], ...})
+    into nodes in suite order: {"name", "script", "required", "category",
+    "exclusive", "deps"}, where deps are the names of the checks of the most
+    recent gate category before the node's own category.
+    """
+    nodes = []
+    gate: List[str] = []
+    for suite_entry in suite:
+        names = []
+        for name, script, required in suite_entry["checks"]:
+            nodes.append({
+                "name": name,
+                "script": script,
+                "required": required,
+                "category": suite_entry["category"],
+                "exclusive": suite_entry.get("exclusive", False),
+                "deps": list(gate),
+            })
+            names.append(name)
+        if suite_entry.get("gate"):
+            gate = names
+    return nodes
+
+
+def run_graph(nodes: List[dict], run: Callable[[dict], dict], workers: Optional[int] = None,
+              stop_on_fail: bool = False, report: Optional[Callable[[dict], None]] = None,
+              cancel_optional: bool = False) -> Tuple[List[dict], bool]:
+    """
+    Run every node through run(node) -> result dict, respecting deps.
+
+    report(result) is called in node order as results become available.
+    With stop_on_fail, a failed required check stops new checks from
+    starting; checks already running are allowed to finish, unless
+    cancel_optional is set: then node["cancel"] (a threading.Event handed
+    to run_command()) is set for every optional check still running.
+
+    Returns (results in node order, stopped).
+    """
+    workers = max(1, workers or default_workers())
+    results: Dict[int, dict] = {}
+    done = set()
+    started = set()
+    running = {}  # future -> node index
+    stopped = False
+    reported = 0
+
+    def ready(i: int) -> bool:
+        node = nodes[i]
+        if i in started or not all(dep in done for dep in node["deps"]):
+            return False
+        if any(nodes[j]["exclusive"] and j not in results for j in range(i)):
+            return False
+        if node["exclusive"]:
+            # Runs alone, and only after every earlier check has finished
+            return not running and all(j in results for j in range(i))
+        return True
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            if not stopped:
+                for i in range(len(nodes)):
+                    if len(running) >= workers:
+                        break
+                    if ready(i):
+                        started.add(i)
+                        nodes[i]["cancel"] = threading.Event()
+                        running[pool.submit(run, nodes[i])] = i
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                i = running.pop(future)
+                result = future.result()
+                result["category"] = nodes[i]["category"]
+                results[i] = result
+                done.add(nodes[i]["name"])
+                if stop_on_fail and nodes[i]["required"] and not result["passed"] and not result.get("skipped"):
+                    stopped = True
+                    if cancel_optional:
+                        for j in running.values():
+                            if not nodes[j]["required"]:
+                                nodes[j]["cancel"].set()
+
+            while reported < len(nodes) and reported in results:
+                if report:
+                    report(results[reported])
+                reported += 1
+
+    # When stopped, later checks never ran; report what did run, in order
+    ordered = [results[i] for i in sorted(results)]
+    if report:
+        for i in sorted(results):
+            if i >= reported:
+                report(results[i])
+    return ordered, stopped
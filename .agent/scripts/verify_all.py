@@ -8,6 +8,19 @@ Use this before deployment or major releases.
 
 Usage:
     python scripts/verify_all.py . --url <URL>
+    python scripts/verify_all.py . --url <URL> --workers 4
+
+Checks run as a dependency graph (see scheduler.py): Security and Code
+Quality are blocking gates, the read-only scanners after them run in
+parallel, and Performance runs alone. Output is printed in suite order.
+Scanners run in-process on warm plugin workers (see plugin_host.py);
+--subprocess runs each in its own interpreter.
+The project is walked once per run (see project_index.py) and the file index
+is shared by every scanner.
+Per-file scanner results are cached in .agent/.cache/ (see check_cache.py), so
+a rerun only reanalyzes changed files; --changed-since <git-ref> limits
+per-file analysis to files changed since that ref (cross-file checks such as
+locale completeness still see the whole tree).
 
 Includes ALL checks:
     ✅ Security Scan (OWASP, secrets, dependencies)
@@ -22,13 +35,18 @@ Includes ALL checks:
     ✅ Mobile Audit (if applicable)
 """
 
+import os
 import sys
-import subprocess
 import argparse
 from pathlib import Path
 from typing import List, Dict, Optional
 from datetime import datetime
 
+from scheduler import build_graph, run_graph, default_workers
+from plugin_host import WorkerPool, run_check_script
+from project_index import MMAP_ENV, changed_files, shared_index
+from check_cache import CACHE_DIR, CACHE_ENV
+
 # ANSI colors
 class Colors:
     HEADER = '\033[95m'
@@ -62,6 +80,7 @@ VERIFICATION_SUITE = [
     # P0: Security (CRITICAL)
     {
         "category": "Security",
+        "gate": True,
         "checks": [
             ("Security Scan", ".agent/skills/vulnerability-scanner/scripts/security_scan.py", True),
             ("Dependency Analysis", ".agent/skills/vulnerability-scanner/scripts/dependency_analyzer.py", False),
@@ -71,6 +90,7 @@ VERIFICATION_SUITE = [
     # P1: Code Quality (CRITICAL)
     {
         "category": "Code Quality",
+        "gate": True,
         "checks": [
             ("Lint Check", ".agent/skills/lint-and-validate/scripts/lint_runner.py", True),
             ("Type Coverage", ".agent/skills/lint-and-validate/scripts/type_coverage.py", False),
@@ -115,6 +135,7 @@ VERIFICATION_SUITE = [
     {
         "category": "Performance",
         "requires_url": True,
+        "exclusive": True,  # Timing-sensitive: nothing else runs alongside
         "checks": [
             ("Lighthouse Audit", ".agent/skills/performance-profiling/scripts/lighthouse_audit.py", True),
             ("Bundle Analysis", ".agent/skills/performance-profiling/scripts/bundle_analyzer.py", False),
@@ -147,57 +168,59 @@ VERIFICATION_SUITE = [
     },
 ]
 
-def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None) -> dict:
-    """Run validation script"""
+def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None,
+               pool: Optional[WorkerPool] = None) -> dict:
+    """Run validation script (quietly: print_check() reports the result)"""
     if not script_path.exists():
-        print_warning(f"{name}: Script not found, skipping")
         return {"name": name, "passed": True, "skipped": True, "duration": 0}
     
-    print_step(f"Running: {name}")
     start_time = datetime.now()
     
-    # Build command
-    cmd = ["python", str(script_path), project_path]
+    # Build arguments
+    args = [project_path]
     if url and ("lighthouse" in script_path.name.lower() or "playwright" in script_path.name.lower()):
-        cmd.append(url)
+        args.append(url)
     
-    # Run
+    # Run in-process on a warm plugin worker when possible, else as a subprocess
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=600  # 10 minute timeout for slow checks
-        )
+        result = run_check_script(str(script_path), args, 600, pool=pool)  # 10 minute timeout for slow checks
         
         duration = (datetime.now() - start_time).total_seconds()
-        passed = result.returncode == 0
-        
-        if passed:
-            print_success(f"{name}: PASSED ({duration:.1f}s)")
-        else:
-            print_error(f"{name}: FAILED ({duration:.1f}s)")
-            if result.stderr:
-                print(f"  {result.stderr[:300]}")
+        if result["timeout"]:
+            return {"name": name, "passed": False, "skipped": False, "duration": duration, "error": "Timeout", "timeout": True}
+        passed = result["returncode"] == 0
         
         return {
             "name": name,
             "passed": passed,
-            "output": result.stdout,
-            "error": result.stderr,
+            "output": result["stdout"],
+            "error": result["stderr"],
             "skipped": False,
             "duration": duration
         }
     
-    except subprocess.TimeoutExpired:
-        duration = (datetime.now() - start_time).total_seconds()
-        print_error(f"{name}: TIMEOUT (>{duration:.0f}s)")
-        return {"name": name, "passed": False, "skipped": False, "duration": duration, "error": "Timeout"}
-    
     except Exception as e:
         duration = (datetime.now() - start_time).total_seconds()
-        print_error(f"{name}: ERROR - {str(e)}")
-        return {"name": name, "passed": False, "skipped": False, "duration": duration, "error": str(e)}
+        return {"name": name, "passed": False, "skipped": False, "duration": duration, "error": str(e), "exception": True}
+
+def print_check(result: dict):
+    """Print one check's buffered result"""
+    name = result["name"]
+    duration = result.get("duration", 0)
+    if result.get("skipped"):
+        print_warning(f"{name}: Script not found, skipping")
+        return
+    print_step(f"Running: {name}")
+    if result.get("timeout"):
+        print_error(f"{name}: TIMEOUT (>{duration:.0f}s)")
+    elif result.get("exception"):
+        print_error(f"{name}: ERROR - {result['error']}")
+    elif result["passed"]:
+        print_success(f"{name}: PASSED ({duration:.1f}s)")
+    else:
+        print_error(f"{name}: FAILED ({duration:.1f}s)")
+        if result.get("error"):
+            print(f"  {result['error'][:300]}")
 
 def print_final_report(results: List[dict], start_time: datetime):
     """Print comprehensive final report"""
@@ -260,6 +283,18 @@ def print_final_report(results: List[dict], start_time: datetime):
         print_success("✨ ALL CHECKS PASSED - Ready for deployment! ✨")
         return True
 
+def select_changed(project_path: Path, ref: Optional[str]) -> Optional[List[str]]:
+    """Files changed since the --changed-since ref (None: scan everything); exits if git fails"""
+    if not ref:
+        return None
+    try:
+        changed = changed_files(project_path, ref)
+    except (OSError, ValueError) as e:
+        print_error(f"--changed-since {ref}: {e}")
+        sys.exit(1)
+    print(f"Changed since {ref}: {len(changed)} file(s)")
+    return changed
+
 def main():
     parser = argparse.ArgumentParser(
         description="Run complete Antigravity Kit verification suite",
@@ -274,10 +309,20 @@ Examples:
     parser.add_argument("--url", required=True, help="URL for performance & E2E checks")
     parser.add_argument("--no-e2e", action="store_true", help="Skip E2E tests")
     parser.add_argument("--stop-on-fail", action="store_true", help="Stop on first failure")
+    parser.add_argument("--workers", type=int, default=default_workers(), help="Checks to run in parallel (default: CPU count, 1 = serial)")
+    parser.add_argument("--subprocess", action="store_true", help="Run every check in its own Python interpreter (no warm plugin workers)")
+    parser.add_argument("--mmap", action="store_true", help="Memory-map large project files instead of reading them")
+    parser.add_argument("--changed-since", metavar="GIT_REF", help="Analyze only files changed since GIT_REF (git diff + untracked files)")
+    parser.add_argument("--no-cache", action="store_true", help=f"Reanalyze every file instead of reusing results cached in {CACHE_DIR}/")
     
     args = parser.parse_args()
     
     project_path = Path(args.project).resolve()
+    if args.mmap:
+        os.environ[MMAP_ENV] = "1"
+    if not args.no_cache:
+        # Scanners reuse per-file results for files whose contents are unchanged
+        os.environ[CACHE_ENV] = str(project_path / CACHE_DIR)
     
     if not project_path.exists():
         print_error(f"Project path does not exist: {project_path}")
@@ -288,35 +333,54 @@ Examples:
     print(f"URL: {args.url}")
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
+    print(f"Workers: {args.workers}")
+    changed = select_changed(project_path, args.changed_since)
+    
     start_time = datetime.now()
-    results = []
     
-    # Run all verification categories
-    for suite in VERIFICATION_SUITE:
-        category = suite["category"]
-        requires_url = suite.get("requires_url", False)
-        
+    # Select verification categories
+    suite = []
+    for entry in VERIFICATION_SUITE:
         # Skip if requires URL and not provided
-        if requires_url and not args.url:
+        if entry.get("requires_url", False) and not args.url:
             continue
         
         # Skip E2E if flag set
-        if args.no_e2e and category == "E2E Testing":
+        if args.no_e2e and entry["category"] == "E2E Testing":
             continue
         
-        print_header(f"📋 {category.upper()}")
-        
-        for name, script_path, required in suite["checks"]:
-            script = project_path / script_path
-            result = run_script(name, script, str(project_path), args.url)
-            result["category"] = category
-            results.append(result)
-            
-            # Stop on critical failure if flag set
-            if args.stop_on_fail and required and not result["passed"] and not result.get("skipped"):
-                print_error(f"CRITICAL: {name} failed. Stopping verification.")
-                print_final_report(results, start_time)
-                sys.exit(1)
+        suite.append(entry)
+    
+    # Run as a dependency graph; results print in suite order as they complete
+    printed_categories = set()
+    
+    def report(result: dict):
+        if result["category"] not in printed_categories:
+            printed_categories.add(result["category"])
+            print_header(f"📋 {result['category'].upper()}")
+        print_check(result)
+    
+    pool = None if args.subprocess else WorkerPool(args.workers)
+    
+    def run_check(node: dict) -> dict:
+        return run_script(node["name"], project_path / node["script"], str(project_path), args.url, pool)
+    
+    nodes = build_graph(suite)
+    # Walk the project once; every check loads this index instead of walking again
+    with shared_index(project_path, changed=changed):
+        try:
+            results, stopped = run_graph(nodes, run_check, args.workers, args.stop_on_fail, report)
+        finally:
+            if pool:
+                pool.close()
+    
+    # Stop on critical failure if flag set
+    if stopped:
+        required = {node["name"] for node in nodes if node["required"]}
+        failed = next(r for r in results if r["name"] in required and not r["passed"] and not r.get("skipped"))
+        print_error(f"CRITICAL: {failed['name']} failed. Stopping verification.")
+        print_final_report(results, start_time)
+        sys.exit(1)
     
     # Print final report
     all_passed = print_final_report(results, start_time)
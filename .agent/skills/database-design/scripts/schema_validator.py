@@ -19,6 +19,14 @@ import re
 from pathlib import Path
 from datetime import datetime
 
+# Shared project file index and result cache (.agent/scripts), importable on plugin workers
+try:
+    import project_index
+except ImportError:  # Started on its own
+    sys.path.append(str(Path(__file__).resolve().parents[3] / "scripts"))
+from project_index import project_files, read_text
+from check_cache import CheckCache
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -31,12 +39,12 @@ def find_schema_files(project_path: Path) -> list:
     schemas = []
     
     # Prisma schema
-    prisma_files = list(project_path.glob('**/prisma/schema.prisma'))
+    prisma_files = list(project_files(project_path, '**/prisma/schema.prisma', changed_only=True))
     schemas.extend([('prisma', f) for f in prisma_files])
     
     # Drizzle schema files
-    drizzle_files = list(project_path.glob('**/drizzle/*.ts'))
-    drizzle_files.extend(project_path.glob('**/schema/*.ts'))
+    drizzle_files = list(project_files(project_path, '**/drizzle/*.ts', changed_only=True))
+    drizzle_files.extend(project_files(project_path, '**/schema/*.ts', changed_only=True))
     for f in drizzle_files:
         if 'schema' in f.name.lower() or 'table' in f.name.lower():
             schemas.append(('drizzle', f))
@@ -49,7 +57,7 @@ def validate_prisma_schema(file_path: Path) -> list:
     issues = []
     
     try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
+        content = read_text(file_path)
         
         # Find all models
         models = re.findall(r'model\s+(\w+)\s*{([^}]+)}', content, re.DOTALL)
@@ -119,12 +127,13 @@ def main():
     
     # Validate each schema
     all_issues = []
+    cache = CheckCache.open("schema_validator", project_path, __file__)
     
     for schema_type, file_path in schemas:
         print(f"\nValidating: {file_path.name} ({schema_type})")
         
         if schema_type == 'prisma':
-            issues = validate_prisma_schema(file_path)
+            issues = cache.run(file_path, validate_prisma_schema)
         else:
             issues = []  # Drizzle validation could be added
         
@@ -134,6 +143,7 @@ def main():
                 "type": schema_type,
                 "issues": issues
             })
+    cache.save()
     
     # Summary
     print("\n" + "="*60)
@@ -20,6 +20,14 @@ import re
 from pathlib import Path
 from datetime import datetime
 
+# Shared project file index and result cache (.agent/scripts), importable on plugin workers
+try:
+    import project_index
+except ImportError:  # Started on its own
+    sys.path.append(str(Path(__file__).resolve().parents[3] / "scripts"))
+from project_index import project_files, read_text
+from check_cache import CheckCache
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -34,7 +42,7 @@ def find_html_files(project_path: Path) -> list:
     
     files = []
     for pattern in patterns:
-        for f in project_path.glob(pattern):
+        for f in project_files(project_path, pattern, changed_only=True):
             if not any(skip in f.parts for skip in skip_dirs):
                 files.append(f)
     
@@ -46,7 +54,7 @@ def check_accessibility(file_path: Path) -> list:
     issues = []
     
     try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
+        content = read_text(file_path)
         
         # Check for form inputs without labels
         inputs = re.findall(r'<input[^>]*>', content, re.IGNORECASE)
@@ -136,14 +144,16 @@ def main():
     
     # Check each file
     all_issues = []
+    cache = CheckCache.open("accessibility_checker", project_path, __file__)
     
     for f in files:
-        issues = check_accessibility(f)
+        issues = cache.run(f, check_accessibility)
         if issues:
             all_issues.append({
                 "file": str(f.name),
                 "issues": issues
             })
+    cache.save()
     
     # Summary
     print("\n" + "="*60)
@@ -95,6 +95,14 @@ import re
 import json
 from pathlib import Path
 
+# Shared project file index and result cache (.agent/scripts), importable on plugin workers
+try:
+    import project_index
+except ImportError:  # Started on its own
+    sys.path.append(str(Path(__file__).resolve().parents[3] / "scripts"))
+from project_index import project_files, read_text
+from check_cache import CheckCache
+
 class UXAuditor:
     def __init__(self):
         self.issues = []
@@ -104,8 +112,7 @@ class UXAuditor:
     
     def audit_file(self, filepath: str) -> None:
         try:
-            with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
+            content = read_text(filepath, errors='replace')
         except: return
         
         self.files_checked += 1
@@ -673,11 +680,25 @@ class UXAuditor:
 
     def audit_directory(self, directory: str) -> None:
         extensions = {'.tsx', '.jsx', '.html', '.vue', '.svelte', '.css'}
-        for root, dirs, files in os.walk(directory):
-            dirs[:] = [d for d in dirs if d not in {'node_modules', '.git', 'dist', 'build', '.next'}]
-            for file in files:
-                if Path(file).suffix in extensions:
-                    self.audit_file(os.path.join(root, file))
+        cache = CheckCache.open("ux_audit", directory, __file__)
+        for filepath in project_files(directory, extensions=extensions, changed_only=True):
+            self.merge(cache.run(filepath, self.audit_one))
+        cache.save()
+
+    @staticmethod
+    def audit_one(filepath) -> list:
+        """audit_file() on a fresh auditor: [issues, warnings, passed_count, files_checked] of one file"""
+        auditor = UXAuditor()
+        auditor.audit_file(str(filepath))
+        return [auditor.issues, auditor.warnings, auditor.passed_count, auditor.files_checked]
+
+    def merge(self, result: list) -> None:
+        """Add one file's audit_one() result"""
+        issues, warnings, passed_count, files_checked = result
+        self.issues += issues
+        self.warnings += warnings
+        self.passed_count += passed_count
+        self.files_checked += files_checked
 
     def get_report(self):
         return {
@@ -21,6 +21,14 @@ import re
 import json
 from pathlib import Path
 
+# Shared project file index and result cache (.agent/scripts), importable on plugin workers
+try:
+    import project_index
+except ImportError:  # Started on its own
+    sys.path.append(str(Path(__file__).resolve().parents[3] / "scripts"))
+from project_index import project_files, read_text
+from check_cache import CheckCache
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -84,7 +92,7 @@ def find_web_pages(project_path: Path) -> list:
     
     files = []
     for pattern in patterns:
-        for f in project_path.glob(pattern):
+        for f in project_files(project_path, pattern, changed_only=True):
             # Skip excluded directories
             if any(skip in f.parts for skip in SKIP_DIRS):
                 continue
@@ -99,7 +107,7 @@ def find_web_pages(project_path: Path) -> list:
 def check_page(file_path: Path) -> dict:
     """Check a single web page for GEO elements."""
     try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
+        content = read_text(file_path)
     except Exception as e:
         return {'file': str(file_path.name), 'passed': [], 'issues': [f"Error: {e}"], 'score': 0}
     
@@ -244,9 +252,11 @@ def main():
     
     # Check each page
     results = []
+    cache = CheckCache.open("geo_checker", target_path, __file__)
     for page in pages:
-        result = check_page(page)
+        result = cache.run(page, check_page)
         results.append(result)
+    cache.save()
     
     # Print results
     for result in results:
@@ -8,6 +8,14 @@ import re
 import json
 from pathlib import Path
 
+# Shared project file index and result cache (.agent/scripts), importable on plugin workers
+try:
+    import project_index
+except ImportError:  # Started on its own
+    sys.path.append(str(Path(__file__).resolve().parents[3] / "scripts"))
+from project_index import project_files, read_text
+from check_cache import CheckCache
+
 # Fix Windows console encoding for Unicode output
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -61,9 +69,10 @@ def find_locale_files(project_path: Path) -> list:
         "**/*.po",  # gettext
     ]
     
+    # Every locale, not only changed ones: completeness compares them with each other
     files = []
     for pattern in patterns:
-        files.extend(project_path.glob(pattern))
+        files.extend(project_files(project_path, pattern))
     
     return [f for f in files if 'node_modules' not in str(f)]
 
@@ -142,7 +151,7 @@ def check_hardcoded_strings(project_path: Path) -> dict:
     
     code_files = []
     for ext in extensions:
-        code_files.extend(project_path.rglob(f"*{ext}"))
+        code_files.extend(project_files(project_path, f"**/*{ext}", changed_only=True))
     
     code_files = [f for f in code_files if not any(x in str(f) for x in 
                   ['node_modules', '.git', 'dist', 'build', '__pycache__', 'venv', 'test', 'spec'])]
@@ -154,33 +163,40 @@ def check_hardcoded_strings(project_path: Path) -> dict:
     files_with_hardcoded = 0
     hardcoded_examples = []
     
+    def analyze(file_path: Path) -> list:
+        """[uses i18n, examples of hardcoded strings] of one file"""
+        content = read_text(file_path)
+        ext = file_path.suffix
+        file_type = extensions.get(ext, 'jsx')
+        
+        # Check for i18n usage
+        has_i18n = any(re.search(p, content) for p in I18N_PATTERNS)
+        
+        # Check for hardcoded strings
+        patterns = HARDCODED_PATTERNS.get(file_type, [])
+        examples = []
+        
+        for pattern in patterns:
+            matches = re.findall(pattern, content)
+            if matches and not has_i18n:
+                examples.append(f"{file_path.name}: {str(matches[0])[:40]}...")
+        
+        return [has_i18n, examples]
+    
+    cache = CheckCache.open("i18n_checker", project_path, __file__, (I18N_PATTERNS, HARDCODED_PATTERNS))
     for file_path in code_files[:50]:  # Limit
         try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            ext = file_path.suffix
-            file_type = extensions.get(ext, 'jsx')
-            
-            # Check for i18n usage
-            has_i18n = any(re.search(p, content) for p in I18N_PATTERNS)
-            if has_i18n:
-                files_with_i18n += 1
-            
-            # Check for hardcoded strings
-            patterns = HARDCODED_PATTERNS.get(file_type, [])
-            hardcoded_found = False
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, content)
-                if matches and not has_i18n:
-                    hardcoded_found = True
-                    if len(hardcoded_examples) < 5:
-                        hardcoded_examples.append(f"{file_path.name}: {str(matches[0])[:40]}...")
-            
-            if hardcoded_found:
-                files_with_hardcoded += 1
-                
+            has_i18n, examples = cache.run(file_path, analyze)
         except:
             continue
+        
+        if has_i18n:
+            files_with_i18n += 1
+        
+        if examples:
+            files_with_hardcoded += 1
+            hardcoded_examples.extend(examples[:5 - len(hardcoded_examples)])
+    cache.save()
     
     passed.append(f"[OK] Analyzed {len(code_files)} code files")
     
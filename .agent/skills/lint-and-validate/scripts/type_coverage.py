@@ -5,9 +5,16 @@ Identifies untyped functions, any usage, and type safety issues.
 """
 import sys
 import re
-import subprocess
 from pathlib import Path
 
+# Shared project file index and result cache (.agent/scripts), importable on plugin workers
+try:
+    import project_index
+except ImportError:  # Started on its own
+    sys.path.append(str(Path(__file__).resolve().parents[3] / "scripts"))
+from project_index import project_files, read_text
+from check_cache import CheckCache
+
 # Fix Windows console encoding for Unicode output
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -15,40 +22,63 @@ try:
 except AttributeError:
     pass  # Python < 3.7
 
+def typescript_file_stats(file_path: Path) -> dict:
+    """Type annotation counts of one TypeScript file."""
+    content = read_text(file_path)
+    
+    # Count 'any' usage
+    any_matches = re.findall(r':\s*any\b', content)
+    
+    # Find functions without return types
+    # function name(params) { - no return type
+    untyped = re.findall(r'function\s+\w+\s*\([^)]*\)\s*{', content)
+    # Arrow functions without types: const fn = (x) => or (x) =>
+    untyped += re.findall(r'=\s*\([^:)]*\)\s*=>', content)
+    
+    # Count typed functions
+    typed = re.findall(r'function\s+\w+\s*\([^)]*\)\s*:\s*\w+', content)
+    typed += re.findall(r':\s*\([^)]*\)\s*=>\s*\w+', content)
+    
+    return {'any_count': len(any_matches), 'untyped_functions': len(untyped), 'total_functions': len(typed) + len(untyped)}
+
+def python_file_stats(file_path: Path) -> dict:
+    """Type hint counts of one Python file."""
+    content = read_text(file_path)
+    
+    # Count Any usage
+    any_matches = re.findall(r':\s*Any\b', content)
+    
+    # Find functions with type hints
+    typed_funcs = re.findall(r'def\s+\w+\s*\([^)]*:[^)]+\)', content)
+    typed_funcs += re.findall(r'def\s+\w+\s*\([^)]*\)\s*->', content)
+    
+    # Find functions without type hints
+    all_funcs = re.findall(r'def\s+\w+\s*\(', content)
+    
+    return {'untyped_functions': len(all_funcs) - len(typed_funcs), 'typed_functions': len(typed_funcs), 'any_count': len(any_matches)}
+
 def check_typescript_coverage(project_path: Path) -> dict:
     """Check TypeScript type coverage."""
     issues = []
     passed = []
     stats = {'any_count': 0, 'untyped_functions': 0, 'total_functions': 0}
     
-    ts_files = list(project_path.rglob("*.ts")) + list(project_path.rglob("*.tsx"))
+    ts_files = list(project_files(project_path, "**/*.ts", changed_only=True))
+    ts_files += project_files(project_path, "**/*.tsx", changed_only=True)
     ts_files = [f for f in ts_files if 'node_modules' not in str(f) and '.d.ts' not in str(f)]
     
     if not ts_files:
         return {'type': 'typescript', 'files': 0, 'passed': [], 'issues': ["[!] No TypeScript files found"], 'stats': stats}
     
+    cache = CheckCache.open("type_coverage.typescript", project_path, __file__)
     for file_path in ts_files[:30]:  # Limit
         try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            
-            # Count 'any' usage
-            any_matches = re.findall(r':\s*any\b', content)
-            stats['any_count'] += len(any_matches)
-            
-            # Find functions without return types
-            # function name(params) { - no return type
-            untyped = re.findall(r'function\s+\w+\s*\([^)]*\)\s*{', content)
-            # Arrow functions without types: const fn = (x) => or (x) =>
-            untyped += re.findall(r'=\s*\([^:)]*\)\s*=>', content)
-            stats['untyped_functions'] += len(untyped)
-            
-            # Count typed functions
-            typed = re.findall(r'function\s+\w+\s*\([^)]*\)\s*:\s*\w+', content)
-            typed += re.findall(r':\s*\([^)]*\)\s*=>\s*\w+', content)
-            stats['total_functions'] += len(typed) + len(untyped)
-            
+            file_stats = cache.run(file_path, typescript_file_stats)
         except Exception:
             continue
+        for key, count in file_stats.items():
+            stats[key] += count
+    cache.save()
     
     # Analyze results
     if stats['any_count'] == 0:
@@ -77,31 +107,21 @@ def check_python_coverage(project_path: Path) -> dict:
     passed = []
     stats = {'untyped_functions': 0, 'typed_functions': 0, 'any_count': 0}
     
-    py_files = list(project_path.rglob("*.py"))
+    py_files = list(project_files(project_path, "**/*.py", changed_only=True))
     py_files = [f for f in py_files if not any(x in str(f) for x in ['venv', '__pycache__', '.git', 'node_modules'])]
     
     if not py_files:
         return {'type': 'python', 'files': 0, 'passed': [], 'issues': ["[!] No Python files found"], 'stats': stats}
     
+    cache = CheckCache.open("type_coverage.python", project_path, __file__)
     for file_path in py_files[:30]:  # Limit
         try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            
-            # Count Any usage
-            any_matches = re.findall(r':\s*Any\b', content)
-            stats['any_count'] += len(any_matches)
-            
-            # Find functions with type hints
-            typed_funcs = re.findall(r'def\s+\w+\s*\([^)]*:[^)]+\)', content)
-            typed_funcs += re.findall(r'def\s+\w+\s*\([^)]*\)\s*->', content)
-            stats['typed_functions'] += len(typed_funcs)
-            
-            # Find functions without type hints
-            all_funcs = re.findall(r'def\s+\w+\s*\(', content)
-            stats['untyped_functions'] += len(all_funcs) - len(typed_funcs)
-            
+            file_stats = cache.run(file_path, python_file_stats)
         except Exception:
             continue
+        for key, count in file_stats.items():
+            stats[key] += count
+    cache.save()
     
     total = stats['typed_functions'] + stats['untyped_functions']
     
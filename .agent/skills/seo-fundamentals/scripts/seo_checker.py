@@ -23,6 +23,14 @@ import re
 from pathlib import Path
 from datetime import datetime
 
+# Shared project file index and result cache (.agent/scripts), importable on plugin workers
+try:
+    import project_index
+except ImportError:  # Started on its own
+    sys.path.append(str(Path(__file__).resolve().parents[3] / "scripts"))
+from project_index import project_files, read_text
+from check_cache import CheckCache
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -81,7 +89,7 @@ def find_pages(project_path: Path) -> list:
     
     files = []
     for pattern in patterns:
-        for f in project_path.glob(pattern):
+        for f in project_files(project_path, pattern, changed_only=True):
             # Skip excluded directories
             if any(skip in f.parts for skip in SKIP_DIRS):
                 continue
@@ -98,7 +106,7 @@ def check_page(file_path: Path) -> dict:
     issues = []
     
     try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
+        content = read_text(file_path)
     except Exception as e:
         return {"file": str(file_path.name), "issues": [f"Error: {e}"]}
     
@@ -169,10 +177,12 @@ def main():
     
     # Check each page
     all_issues = []
+    cache = CheckCache.open("seo_checker", project_path, __file__, SKIP_PATTERNS)
     for f in pages:
-        result = check_page(f)
+        result = cache.run(f, check_page)
         if result["issues"]:
             all_issues.append(result)
+    cache.save()
     
     # Summary
     print("=" * 60)
@@ -22,6 +22,14 @@ from pathlib import Path
 from typing import Dict, List, Any
 from datetime import datetime
 
+# Shared project file index and result cache (.agent/scripts), importable on plugin workers
+try:
+    import project_index
+except ImportError:  # Started on its own
+    sys.path.append(str(Path(__file__).resolve().parents[3] / "scripts"))
+from project_index import project_files, read_text
+from check_cache import CheckCache
+
 # Fix Windows console encoding for Unicode output
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -85,7 +93,6 @@ DANGEROUS_PATTERNS = [
     (r'yaml\.load\s*\([^)]*\)(?!\s*,\s*Loader)', "Unsafe YAML load", "high", "Deserialization risk"),
 ]
 
-SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', '__pycache__', '.venv', 'venv', '.next'}
 CODE_EXTENSIONS = {'.js', '.ts', '.jsx', '.tsx', '.py', '.go', '.java', '.rb', '.php'}
 CONFIG_EXTENSIONS = {'.json', '.yaml', '.yml', '.toml', '.env', '.env.local', '.env.development'}
 
@@ -191,34 +198,35 @@ def scan_secrets(project_path: str) -> Dict[str, Any]:
         "by_severity": {"critical": 0, "high": 0, "medium": 0}
     }
     
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS and ext not in CONFIG_EXTENSIONS:
-                continue
-                
-            filepath = Path(root) / file
-            results["scanned_files"] += 1
+    def analyze(filepath: Path) -> List[Dict[str, Any]]:
+        content = read_text(filepath)
+        findings = []
+        for pattern, secret_type, severity in SECRET_PATTERNS:
+            matches = re.findall(pattern, content, re.IGNORECASE)
+            if matches:
+                findings.append({
+                    "file": str(filepath.relative_to(project_path)),
+                    "type": secret_type,
+                    "severity": severity,
+                    "count": len(matches)
+                })
+        return findings
+    
+    cache = CheckCache.open("security_scan.secrets", project_path, __file__, SECRET_PATTERNS)
+    for filepath in project_files(project_path, changed_only=True):
+        ext = filepath.suffix.lower()
+        if ext not in CODE_EXTENSIONS and ext not in CONFIG_EXTENSIONS:
+            continue
             
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    for pattern, secret_type, severity in SECRET_PATTERNS:
-                        matches = re.findall(pattern, content, re.IGNORECASE)
-                        if matches:
-                            results["findings"].append({
-                                "file": str(filepath.relative_to(project_path)),
-                                "type": secret_type,
-                                "severity": severity,
-                                "count": len(matches)
-                            })
-                            results["by_severity"][severity] += len(matches)
-                            
-            except Exception:
-                pass
+        results["scanned_files"] += 1
+        
+        try:
+            for finding in cache.run(filepath, analyze):
+                results["findings"].append(finding)
+                results["by_severity"][finding["severity"]] += finding["count"]
+        except Exception:
+            pass
+    cache.save()
     
     if results["by_severity"]["critical"] > 0:
         results["status"] = "[!!] CRITICAL: Secrets exposed!"
@@ -246,36 +254,38 @@ def scan_code_patterns(project_path: str) -> Dict[str, Any]:
         "by_category": {}
     }
     
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS:
-                continue
-                
-            filepath = Path(root) / file
-            results["scanned_files"] += 1
+    def analyze(filepath: Path) -> List[Dict[str, Any]]:
+        lines = read_text(filepath).split('\n')
+        findings = []
+        for line_num, line in enumerate(lines, 1):
+            for pattern, name, severity, category in DANGEROUS_PATTERNS:
+                if re.search(pattern, line, re.IGNORECASE):
+                    findings.append({
+                        "file": str(filepath.relative_to(project_path)),
+                        "line": line_num,
+                        "pattern": name,
+                        "severity": severity,
+                        "category": category,
+                        "snippet": line.strip()[:80]
+                    })
+        return findings
+    
+    cache = CheckCache.open("security_scan.patterns", project_path, __file__, DANGEROUS_PATTERNS)
+    for filepath in project_files(project_path, changed_only=True):
+        ext = filepath.suffix.lower()
+        if ext not in CODE_EXTENSIONS:
+            continue
             
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                    
-                    for line_num, line in enumerate(lines, 1):
-                        for pattern, name, severity, category in DANGEROUS_PATTERNS:
-                            if re.search(pattern, line, re.IGNORECASE):
-                                results["findings"].append({
-                                    "file": str(filepath.relative_to(project_path)),
-                                    "line": line_num,
-                                    "pattern": name,
-                                    "severity": severity,
-                                    "category": category,
-                                    "snippet": line.strip()[:80]
-                                })
-                                results["by_category"][category] = results["by_category"].get(category, 0) + 1
-                                
-            except Exception:
-                pass
+        results["scanned_files"] += 1
+        
+        try:
+            for finding in cache.run(filepath, analyze):
+                results["findings"].append(finding)
+                category = finding["category"]
+                results["by_category"][category] = results["by_category"].get(category, 0) + 1
+        except Exception:
+            pass
+    cache.save()
     
     critical_count = sum(1 for f in results["findings"] if f["severity"] == "critical")
     high_count = sum(1 for f in results["findings"] if f["severity"] == "high")
@@ -315,30 +325,25 @@ def scan_configuration(project_path: str) -> Dict[str, Any]:
         (r'allowCredentials.*true.*origin.*\*', "Dangerous CORS combo", "critical"),
     ]
     
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CONFIG_EXTENSIONS and file not in ['next.config.js', 'webpack.config.js', '.eslintrc.js']:
-                continue
-                
-            filepath = Path(root) / file
+    def analyze(filepath: Path) -> List[Dict[str, Any]]:
+        content = read_text(filepath)
+        return [{
+            "file": str(filepath.relative_to(project_path)),
+            "issue": issue,
+            "severity": severity
+        } for pattern, issue, severity in config_issues if re.search(pattern, content, re.IGNORECASE)]
+    
+    cache = CheckCache.open("security_scan.config", project_path, __file__, config_issues)
+    for filepath in project_files(project_path, changed_only=True):
+        ext = filepath.suffix.lower()
+        if ext not in CONFIG_EXTENSIONS and filepath.name not in ['next.config.js', 'webpack.config.js', '.eslintrc.js']:
+            continue
             
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    for pattern, issue, severity in config_issues:
-                        if re.search(pattern, content, re.IGNORECASE):
-                            results["findings"].append({
-                                "file": str(filepath.relative_to(project_path)),
-                                "issue": issue,
-                                "severity": severity
-                            })
-                            
-            except Exception:
-                pass
+        try:
+            results["findings"].extend(cache.run(filepath, analyze))
+        except Exception:
+            pass
+    cache.save()
     
     # Check for security header configurations
     header_files = ["next.config.js", "next.config.mjs", "middleware.ts", "nginx.conf"]